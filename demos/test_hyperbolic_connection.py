@@ -179,7 +179,7 @@ def run_connection_test():
         try:
             # Create FileTransfer instance
             from video_agent.file_transfer import FileTransfer
-            file_transfer = FileTransfer(processor.instance_id)
+            file_transfer = FileTransfer.get(processor.instance_id)
             
             # Upload using curl approach
             file_transfer.upload_file(test_file, remote_test_path)
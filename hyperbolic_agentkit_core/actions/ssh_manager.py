@@ -15,6 +15,7 @@ class SSHManager:
     _connected = False
     _host = None
     _username = None
+    _port = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -74,6 +75,7 @@ class SSHManager:
                 self._connected = True
                 self._host = host
                 self._username = username
+                self._port = port
                 return f"Successfully connected to {host} as {username} using password"
             
             # Try connecting with provided key or default key
@@ -95,6 +97,7 @@ class SSHManager:
                         if self._connected:
                             self._host = host
                             self._username = username
+                            self._port = port
                             return f"Successfully connected to {host} as {username} using key {alt_key}"
                     except Exception as e:
                         logger.warning(f"Failed with key {alt_key}: {str(e)}")
@@ -109,6 +112,7 @@ class SSHManager:
                 if self._connected:
                     self._host = host
                     self._username = username
+                    self._port = port
                     return f"Successfully connected to {host} as {username} using key {key_path}"
                 else:
                     return f"SSH Connection Error: Failed to connect with key {key_path}"
@@ -300,6 +304,7 @@ class SSHManager:
         self._connected = False
         self._host = None
         self._username = None
+        self._port = None
 
     def get_connection_info(self) -> Dict[str, Any]:
         """Get current connection information."""
@@ -308,6 +313,7 @@ class SSHManager:
                 "status": "connected",
                 "host": self._host,
                 "username": self._username,
+                "port": self._port,
                 "transport_active": self._ssh_client.get_transport().is_active() if self._ssh_client else False
             }
         return {"status": "disconnected"}
@@ -0,0 +1,585 @@
+"""
+Unit tests for the FileTransfer helpers.
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+import asyncio
+import threading
+import hashlib
+import subprocess
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from video_agent.file_transfer import (
+    FileTransfer,
+    _GZIP_CODEC,
+    _VERIFY_SCRIPT,
+    _ZSTD_CODEC,
+    _MultipartFile,
+    _backoff,
+    _parse_ssh_command,
+    _run_coroutine,
+    _split_nul,
+)
+
+
+def _make_transfer():
+    """Create a FileTransfer without touching the network."""
+    transfer = object.__new__(FileTransfer)
+    transfer.instance_id = "test-instance"
+    transfer._get_ssh_info = MagicMock(return_value={"host": "1.2.3.4", "username": "ubuntu", "port": 22})
+    transfer._get_ssh_key_path = MagicMock(return_value="/tmp/test_key")
+    transfer._ip_cache = None
+    transfer._master_target = None
+    transfer._master_failed = True
+    transfer._remote_has_zstd = None
+    transfer._local_hashes = {}
+    transfer._ensure_ssh_access = MagicMock()
+    return transfer
+
+
+def _mock_pool():
+    """Create a mock _borrow_client whose client runs commands successfully."""
+    client = MagicMock()
+    stdout = MagicMock()
+    stdout.channel.recv_exit_status.return_value = 0
+    client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+    borrow = MagicMock()
+    borrow.return_value.__enter__.return_value = client
+    return borrow, client
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test cases for FileTransfer.run_batch."""
+
+    def _run(self, commands, output):
+        """Run a batch against a mocked client whose stdout is output."""
+        client = MagicMock()
+        stdout = MagicMock()
+        stdout.read.return_value = output.encode()
+        stdout.channel.recv_exit_status.return_value = 0
+        client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+
+        borrow = MagicMock()
+        borrow.return_value.__enter__.return_value = client
+        with patch('video_agent.file_transfer._borrow_client', borrow), \
+             patch('video_agent.file_transfer.uuid.uuid4', return_value=MagicMock(hex="tok")):
+            results = _make_transfer().run_batch(commands)
+        return results, client
+
+    def test_splits_status_and_output(self):
+        """Test that each command gets its own exit status and stdout."""
+        output = (
+            "\n__SEP_tok_0__\n"
+            "/home/ubuntu\n\n__SEP_tok_0__\n"
+            "\n__SEP_tok_1__\n"
+        )
+        results, client = self._run(["sudo -n true", "echo $HOME", "command -v ffmpeg"], output)
+
+        self.assertEqual(results, [(0, ""), (0, "/home/ubuntu\n"), (1, "")])
+        client.exec_command.assert_called_once()
+
+    def test_ignores_separator_like_output(self):
+        """Test that output resembling a separator with another token is kept as output."""
+        output = "\n__SEP_other_7__\n\n__SEP_tok_0__\n"
+        results, _ = self._run(["echo fake"], output)
+
+        self.assertEqual(results, [(0, "\n__SEP_other_7__\n")])
+
+    def test_batch_ended_early(self):
+        """Test that a truncated batch raises instead of returning partial results."""
+        output = "first\n__SEP_tok_0__\n"
+        with self.assertRaises(RuntimeError):
+            self._run(["echo first", "echo second"], output)
+
+    def test_empty_batch(self):
+        """Test that an empty batch does not open a connection."""
+        with patch('video_agent.file_transfer._borrow_client') as borrow:
+            self.assertEqual(_make_transfer().run_batch([]), [])
+        borrow.assert_not_called()
+
+
+class TestParseSshCommand(unittest.TestCase):
+    """Test cases for _parse_ssh_command."""
+
+    def test_host_and_port(self):
+        """Test that host and port are taken from the command."""
+        self.assertEqual(_parse_ssh_command("ssh ubuntu@gpu.example.com -p 31234"), ("gpu.example.com", 31234))
+
+    def test_default_port(self):
+        """Test that a command without -p uses port 22."""
+        self.assertEqual(_parse_ssh_command("ssh ubuntu@10.0.0.5"), ("10.0.0.5", 22))
+
+    def test_no_host(self):
+        """Test that a command without user@host is rejected."""
+        self.assertIsNone(_parse_ssh_command("ssh -p 22"))
+
+
+class TestGetInstanceIp(unittest.TestCase):
+    """Test cases for FileTransfer._get_instance_ip."""
+
+    def _resolve(self, instance):
+        """Resolve the address of test-instance from a status listing holding instance."""
+        status = {"instances": [dict(instance, id="test-instance")]}
+        with patch('video_agent.file_transfer._get_gpu_status_cached', return_value=status):
+            return _make_transfer()._get_instance_ip()
+
+    def test_ssh_command_first(self):
+        """Test that the top-level sshCommand beats every address field."""
+        address = self._resolve({"sshCommand": "ssh ubuntu@cmd.host -p 2200", "ip": "1.1.1.1"})
+        self.assertEqual(address, ("cmd.host", 2200))
+
+    def test_field_priority(self):
+        """Test that address fields are checked in priority order."""
+        address = self._resolve({"network": {"ip": "3.3.3.3"}, "ipAddress": "2.2.2.2"})
+        self.assertEqual(address, ("2.2.2.2", 22))
+
+    def test_ssh_host_and_port(self):
+        """Test that ssh.host is paired with ssh.port."""
+        address = self._resolve({"ssh": {"host": "4.4.4.4", "port": "2222"}})
+        self.assertEqual(address, ("4.4.4.4", 2222))
+
+    def test_invalid_port(self):
+        """Test that an unparseable ssh.port falls back to port 22."""
+        address = self._resolve({"ssh": {"host": "4.4.4.4", "port": "ssh"}})
+        self.assertEqual(address, ("4.4.4.4", 22))
+
+    def test_top_level_ip_beats_nested_ssh_command(self):
+        """Test that the nested instance is only consulted when no top-level field is set."""
+        address = self._resolve({"ip": "1.1.1.1", "instance": {"sshCommand": "ssh ubuntu@nested.host -p 2200"}})
+        self.assertEqual(address, ("1.1.1.1", 22))
+
+    def test_nested_instance(self):
+        """Test the nested sshCommand and then the nested address fields."""
+        address = self._resolve({"instance": {"sshCommand": "ssh ubuntu@nested.host -p 2200", "ip": "5.5.5.5"}})
+        self.assertEqual(address, ("nested.host", 2200))
+        address = self._resolve({"instance": {"hostname": "nested.example.com"}})
+        self.assertEqual(address, ("nested.example.com", 22))
+
+    def test_not_found(self):
+        """Test that an instance missing from the listing has no address."""
+        with patch('video_agent.file_transfer._get_gpu_status_cached', return_value={"instances": []}):
+            self.assertIsNone(_make_transfer()._get_instance_ip())
+
+
+class TestListingHelpers(unittest.TestCase):
+    """Test cases for the NUL-delimited listing helpers."""
+
+    def test_split_nul(self):
+        """Test that NUL-terminated paths keep newlines and spaces intact."""
+        data = b"/w/a b.mp4\0/w/line\nbreak.txt\0"
+        self.assertEqual(_split_nul(data), ["/w/a b.mp4", "/w/line\nbreak.txt"])
+        self.assertEqual(_split_nul(b""), [])
+
+    def _client(self, blocks, exit_status=0, stderr=b""):
+        """Create a mock client whose find output arrives in the given blocks."""
+        channel = MagicMock()
+        channel.recv.side_effect = list(blocks) + [b""]
+        channel.recv_exit_status.return_value = exit_status
+        stdout = MagicMock(channel=channel)
+        err = MagicMock()
+        err.read.return_value = stderr
+        client = MagicMock()
+        client.exec_command.return_value = (MagicMock(), stdout, err)
+        return client, channel
+
+    def test_find_files_across_blocks(self):
+        """Test that paths split across recv blocks are joined back together."""
+        client, channel = self._client([b"/w/fir", b"st.mp4\0/w/sec", b"ond.mp4\0", b"/w/third\0"])
+        files = list(_make_transfer()._find_files(client, "/w"))
+
+        self.assertEqual(files, ["/w/first.mp4", "/w/second.mp4", "/w/third"])
+        channel.close.assert_called_once()
+
+    def test_find_files_missing_directory(self):
+        """Test that a missing directory lists nothing."""
+        client, _ = self._client([], exit_status=1, stderr=b"__MISSING__\n")
+        self.assertEqual(list(_make_transfer()._find_files(client, "/missing")), [])
+
+    def test_list_async_without_asyncssh(self):
+        """Test that the async listing falls back to the paramiko listing without asyncssh."""
+        transfer = _make_transfer()
+        transfer.iter_remote_files = MagicMock(return_value=iter(["/w/b", "/w/a"]))
+        with patch('video_agent.file_transfer.asyncssh', None):
+            files = asyncio.run(transfer.list_remote_files_async("/w"))
+
+        self.assertEqual(files, ["/w/a", "/w/b"])
+        transfer.iter_remote_files.assert_called_once_with("/w")
+
+    def test_find_files_failure(self):
+        """Test that a failing find raises after yielding what it listed."""
+        client, _ = self._client([b"/w/a\0"], exit_status=1, stderr=b"find: permission denied\n")
+        files = []
+        with self.assertRaises(RuntimeError):
+            for path in _make_transfer()._find_files(client, "/w"):
+                files.append(path)
+        self.assertEqual(files, ["/w/a"])
+
+
+class TestMultipartFile(unittest.TestCase):
+    """Test cases for _MultipartFile."""
+
+    def test_framing_and_length(self):
+        """Test that the streamed body is framed correctly and matches its length."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'clip "1".mp4')
+            payload = os.urandom(2500)
+            with open(path, "wb") as f:
+                f.write(payload)
+
+            body_file = _MultipartFile("file", path, block_size=1024)
+            body = b"".join(body_file)
+            self.assertEqual(len(body), len(body_file))
+
+        boundary = body_file.content_type.split("boundary=", 1)[1]
+        self.assertTrue(body.startswith(f"--{boundary}\r\n".encode()))
+        self.assertIn(b'name="file"; filename="clip %221%22.mp4"', body)
+        self.assertTrue(body.endswith(f"\r\n--{boundary}--\r\n".encode()))
+        self.assertIn(b"\r\n\r\n" + payload + b"\r\n--", body)
+
+
+class TestBackoff(unittest.TestCase):
+    """Test cases for _backoff."""
+
+    def test_bounds(self):
+        """Test that delays stay within [0, min(cap, base * 2**attempt)]."""
+        for attempt in range(10):
+            limit = min(60.0, 2 ** attempt)
+            for _ in range(50):
+                delay = _backoff(attempt)
+                self.assertGreaterEqual(delay, 0)
+                self.assertLessEqual(delay, limit)
+
+    def test_custom_base_and_cap(self):
+        """Test that base scales the delay and cap bounds it."""
+        with patch('video_agent.file_transfer.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(_backoff(0, base=0.5), 0.5)
+            self.assertEqual(_backoff(3, base=0.5), 4.0)
+            self.assertEqual(_backoff(20, base=0.5, cap=10.0), 10.0)
+
+
+class TestWithoutMasterConnection(unittest.TestCase):
+    """Test cases for transfers when the ssh ControlMaster could not open."""
+
+    def setUp(self):
+        """Create a local file to transfer."""
+        self.test_dir = tempfile.mkdtemp()
+        self.local_path = os.path.join(self.test_dir, "clip.mp4")
+        with open(self.local_path, "wb") as f:
+            f.write(b"video data")
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.test_dir)
+
+    def test_stream_upload_uses_sftp(self):
+        """Test that the default upload path goes over paramiko SFTP instead of the ssh binary."""
+        borrow, client = _mock_pool()
+        transfer = _make_transfer()
+        transfer._verify_remote_file = MagicMock(return_value=True)
+        with patch('video_agent.file_transfer._borrow_client', borrow), \
+             patch('video_agent.file_transfer.subprocess.run') as mock_run:
+            transfer._stream_upload(self.local_path, "/workspace/in/clip.mp4")
+
+        mock_run.assert_not_called()
+        client.exec_command.assert_called_once()
+        self.assertIn("mkdir -p /workspace/in", client.exec_command.call_args[0][0])
+        client.open_sftp.return_value.put.assert_called_once_with(self.local_path, "/workspace/in/clip.mp4")
+        transfer._verify_remote_file.assert_called_once_with(self.local_path, "/workspace/in/clip.mp4")
+
+    def test_upload_file_skips_scp(self):
+        """Test that a failed SFTP upload is reported without trying scp."""
+        borrow, _ = _mock_pool()
+        transfer = _make_transfer()
+        transfer._verify_remote_file = MagicMock(return_value=False)
+        with patch('video_agent.file_transfer._borrow_client', borrow), \
+             patch('video_agent.file_transfer.asyncssh', None), \
+             patch('video_agent.file_transfer.time.sleep'), \
+             patch('video_agent.file_transfer.subprocess.run') as mock_run:
+            with self.assertRaises(RuntimeError):
+                transfer.upload_file(self.local_path, "/workspace/in/clip.mp4", max_retries=2)
+
+        mock_run.assert_not_called()
+        self.assertEqual(transfer._verify_remote_file.call_count, 2)
+
+    def test_download_file_uses_sftp(self):
+        """Test that downloads go over paramiko SFTP instead of scp."""
+        borrow, client = _mock_pool()
+        transfer = _make_transfer()
+        transfer._remote_exec = MagicMock(return_value=(0, "", ""))
+        local_path = os.path.join(self.test_dir, "out", "result.mp4")
+        with patch.dict(os.environ, {"SSH_PRIVATE_KEY_PATH": "/tmp/test_key"}), \
+             patch('video_agent.file_transfer._borrow_client', borrow), \
+             patch('video_agent.file_transfer.subprocess.run') as mock_run:
+            transfer.download_file("/workspace/out/result.mp4", local_path)
+
+        mock_run.assert_not_called()
+        client.open_sftp.return_value.get.assert_called_once_with("/workspace/out/result.mp4", local_path)
+
+    def test_upload_directory_uses_upload_files(self):
+        """Test that a directory is sent file by file, extracted inside remote_dir like the tar stream."""
+        os.makedirs(os.path.join(self.test_dir, "sub"))
+        with open(os.path.join(self.test_dir, "sub", "frame.png"), "wb") as f:
+            f.write(b"png")
+        transfer = _make_transfer()
+        transfer.upload_files = MagicMock()
+        with patch('video_agent.file_transfer.subprocess.run') as mock_run:
+            transfer.upload_directory(self.test_dir, "/workspace/in")
+
+        mock_run.assert_not_called()
+        base = os.path.basename(self.test_dir)
+        pairs = sorted(transfer.upload_files.call_args[0][0])
+        self.assertEqual(pairs, [
+            (self.local_path, f"/workspace/in/{base}/clip.mp4"),
+            (os.path.join(self.test_dir, "sub", "frame.png"), f"/workspace/in/{base}/sub/frame.png"),
+        ])
+
+
+class TestRunCoroutine(unittest.TestCase):
+    """Test cases for _run_coroutine."""
+
+    async def _thread_name(self):
+        """Report which thread the coroutine ran on."""
+        return threading.current_thread().name
+
+    def test_without_running_loop(self):
+        """Test that the coroutine runs on the calling thread when no loop is running."""
+        self.assertEqual(_run_coroutine(self._thread_name()), threading.current_thread().name)
+
+    def test_inside_running_loop(self):
+        """Test that the coroutine still completes when called from async code."""
+        async def caller():
+            return _run_coroutine(self._thread_name())
+
+        self.assertTrue(asyncio.run(caller()).startswith("file-transfer-async"))
+
+    def test_propagates_errors(self):
+        """Test that an exception raised by the coroutine reaches the caller."""
+        async def fail():
+            raise ValueError("boom")
+
+        async def caller():
+            return _run_coroutine(fail())
+
+        with self.assertRaises(ValueError):
+            asyncio.run(caller())
+
+
+class TestUploadVerification(unittest.TestCase):
+    """Test cases for verifying uploads against the local file."""
+
+    def setUp(self):
+        """Create a local file to verify against."""
+        self.test_dir = tempfile.mkdtemp()
+        self.local_path = os.path.join(self.test_dir, "clip.mp4")
+        self.data = b"video data"
+        with open(self.local_path, "wb") as f:
+            f.write(self.data)
+        self.digest = hashlib.sha256(self.data).hexdigest()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.test_dir)
+
+    def _matches(self, returncode, stdout):
+        """Check verify output for the local file."""
+        return _make_transfer()._matches_local_file(self.local_path, "/w/clip.mp4", returncode,
+                                                    stdout, self.digest)
+
+    def test_match(self):
+        """Test that matching size and digest verify the upload."""
+        self.assertTrue(self._matches(0, f"{len(self.data)}\n{self.digest}  -\n"))
+
+    def test_size_mismatch(self):
+        """Test that a truncated remote file fails verification."""
+        self.assertFalse(self._matches(0, f"{len(self.data) - 1}\n{self.digest}  -\n"))
+
+    def test_digest_mismatch(self):
+        """Test that a remote file with the right size but wrong content fails verification."""
+        self.assertFalse(self._matches(0, f"{len(self.data)}\n{'0' * 64}  -\n"))
+
+    def test_missing_digest(self):
+        """Test that output with no digest fails verification."""
+        self.assertFalse(self._matches(0, f"{len(self.data)}\n"))
+
+    def test_nonzero_status(self):
+        """Test that a failed verify command fails verification, whatever it printed."""
+        self.assertFalse(self._matches(1, f"{len(self.data)}\n{self.digest}  -\n"))
+        self.assertFalse(self._matches(1, ""))
+
+    @unittest.skipUnless(shutil.which("sha256sum") and shutil.which("stat"), "needs GNU coreutils")
+    def test_verify_script_output(self):
+        """Test that the real verify script's output parses, even for names sha256sum would escape."""
+        odd_path = os.path.join(self.test_dir, "clip\\1.mp4")
+        shutil.copy(self.local_path, odd_path)
+        process = subprocess.run(["sh", "-c", _VERIFY_SCRIPT, "sh", odd_path], capture_output=True, text=True)
+
+        transfer = _make_transfer()
+        self.assertTrue(transfer._matches_local_file(odd_path, odd_path, process.returncode,
+                                                     process.stdout, self.digest))
+
+    def test_hash_cache_and_release(self):
+        """Test that a file is hashed once until its hash is used, then evicted."""
+        transfer = _make_transfer()
+        first = transfer._hash_local_file(self.local_path)
+        self.assertIs(transfer._hash_local_file(self.local_path), first)
+        self.assertEqual(first.result(), self.digest)
+
+        transfer._release_local_hash(first)
+        self.assertEqual(transfer._local_hashes, {})
+        second = transfer._hash_local_file(self.local_path)
+        self.assertIsNot(second, first)
+
+        # Releasing a stale future leaves the current one alone
+        transfer._release_local_hash(first)
+        self.assertEqual(list(transfer._local_hashes.values()), [second])
+
+    def test_hash_rekeyed_on_change(self):
+        """Test that a modified file gets a fresh hash."""
+        transfer = _make_transfer()
+        first = transfer._hash_local_file(self.local_path)
+        first.result()
+        with open(self.local_path, "ab") as f:
+            f.write(b" more")
+        os.utime(self.local_path, ns=(0, os.stat(self.local_path).st_mtime_ns + 1))
+
+        second = transfer._hash_local_file(self.local_path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.result(), hashlib.sha256(self.data + b" more").hexdigest())
+
+    def test_verify_releases_hash(self):
+        """Test that verifying an upload evicts the hash it used."""
+        transfer = _make_transfer()
+        transfer._remote_exec = MagicMock(return_value=(0, f"{len(self.data)}\n{self.digest}  -\n", ""))
+        self.assertTrue(transfer._verify_remote_file(self.local_path, "/w/clip.mp4"))
+        self.assertEqual(transfer._local_hashes, {})
+
+    def test_failed_upload_releases_hash(self):
+        """Test that the hash is evicted when every attempt fails before verification."""
+        transfer = _make_transfer()
+        borrow = MagicMock(side_effect=OSError("connection refused"))
+        with patch('video_agent.file_transfer._borrow_client', borrow), \
+             patch('video_agent.file_transfer.asyncssh', None), \
+             patch('video_agent.file_transfer.time.sleep'):
+            with self.assertRaises(RuntimeError):
+                transfer.upload_file(self.local_path, "/w/clip.mp4", max_retries=2)
+
+        self.assertEqual(transfer._local_hashes, {})
+
+
+class TestUploadCodec(unittest.TestCase):
+    """Test cases for FileTransfer._upload_codec."""
+
+    def _transfer(self, *returncodes):
+        """Create a transfer whose zstd probes exit with the given statuses."""
+        transfer = _make_transfer()
+        transfer._ssh_run = MagicMock(side_effect=[
+            subprocess.CompletedProcess("command -v zstd", returncode, "", "") for returncode in returncodes
+        ])
+        return transfer
+
+    @patch('video_agent.file_transfer._HAS_LOCAL_ZSTD', True)
+    def test_remote_zstd(self):
+        """Test that zstd is used and remembered when the instance has it."""
+        transfer = self._transfer(0)
+        self.assertEqual(transfer._upload_codec(), _ZSTD_CODEC)
+        self.assertEqual(transfer._upload_codec(), _ZSTD_CODEC)
+        transfer._ssh_run.assert_called_once()
+
+    @patch('video_agent.file_transfer._HAS_LOCAL_ZSTD', True)
+    @patch('video_agent.file_transfer._LOCAL_GZIP', 'gzip')
+    def test_no_remote_zstd(self):
+        """Test that gzip is used and remembered when the instance lacks zstd."""
+        transfer = self._transfer(1)
+        self.assertEqual(transfer._upload_codec(), _GZIP_CODEC)
+        self.assertEqual(transfer._upload_codec(), _GZIP_CODEC)
+        transfer._ssh_run.assert_called_once()
+
+    @patch('video_agent.file_transfer._HAS_LOCAL_ZSTD', True)
+    def test_probe_connection_failure_not_cached(self):
+        """Test that a probe that could not reach the instance is retried next time."""
+        transfer = self._transfer(255, 0)
+        compress_cmd, _ = transfer._upload_codec()
+        self.assertIn(compress_cmd[0], ("gzip", "pigz"))
+        self.assertIsNone(transfer._remote_has_zstd)
+
+        self.assertEqual(transfer._upload_codec(), _ZSTD_CODEC)
+        self.assertEqual(transfer._ssh_run.call_count, 2)
+
+    @patch('video_agent.file_transfer._HAS_LOCAL_ZSTD', False)
+    @patch('video_agent.file_transfer._LOCAL_GZIP', 'pigz')
+    def test_pigz_without_local_zstd(self):
+        """Test that pigz compresses for a plain gzip decompressor, without probing the instance."""
+        transfer = self._transfer()
+        self.assertEqual(transfer._upload_codec(), (["pigz", "-c"], ["gzip", "-d", "-c"]))
+        transfer._ssh_run.assert_not_called()
+
+
+@unittest.skipUnless(shutil.which("tar") and shutil.which("gzip"), "needs tar and gzip")
+class TestTarPipelines(unittest.TestCase):
+    """Test cases for the tar directory pipelines, with the instance played by a local shell."""
+
+    def setUp(self):
+        """Create a local tree and a transfer whose ssh commands run locally."""
+        self.test_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.test_dir, "frames")
+        os.makedirs(os.path.join(self.source, "sub dir"))
+        self.files = {
+            "a.txt": b"first",
+            os.path.join("sub dir", "b.bin"): os.urandom(4096),
+        }
+        for name, data in self.files.items():
+            with open(os.path.join(self.source, name), "wb") as f:
+                f.write(data)
+
+        self.transfer = _make_transfer()
+        self.transfer._ssh_command = lambda remote_command: ["sh", "-c", remote_command]
+        self.transfer._remote_has_zstd = False
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        """Test that a tree uploaded and downloaded again is unchanged."""
+        remote_dir = os.path.join(self.test_dir, "remote", "in")
+        self.transfer._bulk_upload_tar(self.source, remote_dir)
+
+        local_dir = os.path.join(self.test_dir, "downloaded")
+        os.makedirs(local_dir)
+        self.transfer._bulk_download_tar(os.path.join(remote_dir, "frames"), local_dir)
+
+        for name, data in self.files.items():
+            with open(os.path.join(local_dir, name), "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_missing_remote_directory(self):
+        """Test that a missing remote directory raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            self.transfer._bulk_download_tar(os.path.join(self.test_dir, "missing"), self.test_dir)
+
+    def test_stage_failure_reported(self):
+        """Test that a failing stage is reported with its status and stderr."""
+        with self.assertRaises(RuntimeError) as context:
+            self.transfer._run_pipeline([["sh", "-c", "echo oops >&2; exit 3"], ["cat"]])
+        self.assertIn("sh exited with status 3: oops", str(context.exception))
+
+    def test_consumer_failure_reported(self):
+        """Test that a consumer exiting early fails the pipeline instead of hanging."""
+        with self.assertRaises(RuntimeError) as context:
+            self.transfer._run_pipeline([["sh", "-c", "while :; do echo data; done"], ["sh", "-c", "exit 2"]])
+        self.assertIn("status 2", str(context.exception))
+
+    def test_success(self):
+        """Test that a pipeline of successful stages returns quietly."""
+        self.transfer._run_pipeline([["echo", "data"], ["cat"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
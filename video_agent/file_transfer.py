@@ -4,38 +4,380 @@ Uses Hyperbolic's SSH access for secure file transfer.
 """
 
 import os
+import re
 import json
+import asyncio
 import time
 import subprocess
 import tempfile
 import hashlib
 import base64
 import uuid
+import random
+import shlex
+import shutil
+import socket
+import stat
+import posixpath
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import paramiko
+import requests
+
+try:
+    import asyncssh
+except ImportError:  # Optional: enables parallel SFTP transfers
+    asyncssh = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # Optional: faster parsing of relay API responses
+    _json_loads = json.loads
 
 from hyperbolic_agentkit_core.actions.ssh_access import connect_ssh
-from hyperbolic_agentkit_core.actions.remote_shell import execute_remote_command
 from hyperbolic_agentkit_core.actions.ssh_manager import ssh_manager
 from hyperbolic_agentkit_core.actions.get_gpu_status import get_gpu_status
 
+# Host and port in an sshCommand such as "ssh ubuntu@host -p 31234"
+_HOST_RE = re.compile(r'@([^:\s]+)')
+_PORT_RE = re.compile(r'-p\s+(\d+)')
+
+# Instance fields that may hold the address, as (ip_path, port_path), in priority order.
+# The nested 'instance' entry is only consulted when none of these are populated.
+_IP_FIELDS: List[Tuple[Tuple[str, ...], Optional[Tuple[str, ...]]]] = [
+    (('ip',), None),
+    (('ipAddress',), None),
+    (('ssh', 'host'), ('ssh', 'port')),
+    (('network', 'ip'), None),
+    (('status', 'ip'), None),
+]
+_NESTED_IP_FIELDS: List[Tuple[Tuple[str, ...], Optional[Tuple[str, ...]]]] = [
+    (('ip',), None),
+    (('ipAddress',), None),
+    (('hostname',), None),
+    (('address',), None),
+]
+
+# Directory archive compressors as (compress argv, decompress argv), fastest first.
+# zstd is multi-threaded; pigz output is plain gzip, so any remote gzip can read it.
+_ZSTD_CODEC = (["zstd", "-T0", "-q", "-c"], ["zstd", "-d", "-q", "-c"])
+_GZIP_CODEC = (["gzip", "-c"], ["gzip", "-d", "-c"])
+_HAS_LOCAL_ZSTD = shutil.which("zstd") is not None
+_LOCAL_GZIP = "pigz" if shutil.which("pigz") else "gzip"
+
+# Exit status ssh (and _paramiko_run) report when the connection itself failed,
+# as opposed to the status of the remote command
+_SSH_CONNECTION_FAILED = 255
+
+# Prints a remote file's size, then "<sha256>  -". Hashing stdin rather than the
+# named file stops sha256sum escaping the digest for names with a backslash or newline.
+_VERIFY_SCRIPT = 'stat -c %s "$1" && sha256sum < "$1"'
+
+# Hashes local files in the background while their upload is in flight
+_HASH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-transfer-sha256")
+
+# How long a GPU status response is reused before asking the API again
+_STATUS_TTL_SECONDS = 60.0
+_status_cache: Optional[Tuple[float, object]] = None
+
+# How long resolved SSH connection info is reused before looking it up again
+_SSH_INFO_TTL_SECONDS = 60.0
+
+# Idle authenticated SSH clients by (host, username, port, compressed), reused across commands
+_SSH_POOL: Dict[Tuple[str, str, int, bool], Deque[paramiko.SSHClient]] = {}
+_SSH_POOL_LOCK = threading.Lock()
+
+
+def _parse_ssh_command(ssh_cmd: str) -> Optional[Tuple[str, int]]:
+    """Extract host and port from an ssh command line.
+    
+    Args:
+        ssh_cmd: SSH command (format: "ssh username@hostname -p port")
+        
+    Returns:
+        Tuple of (host, port) if a host was found, None otherwise
+    """
+    host_match = _HOST_RE.search(ssh_cmd)
+    if not host_match:
+        return None
+    
+    # The pattern only matches digits, so int() cannot fail here
+    port_match = _PORT_RE.search(ssh_cmd)
+    port = int(port_match.group(1)) if port_match else 22
+    return (host_match.group(1), port)
+
+
+def _get_field(data: Dict, path: Tuple[str, ...]):
+    """Walk nested dicts along path, returning None if any step is missing."""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _sha256_file(path: str, block_size: int = 1 << 20) -> str:
+    """Compute the hex SHA-256 digest of a file.
+    
+    hashlib uses OpenSSL, which picks the CPU's SHA instructions where available.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _MultipartFile:
+    """Streaming multipart/form-data body holding a single file field.
+    
+    requests reads files= uploads fully into memory before sending; this yields
+    the file in blocks instead and reports its length so no chunked encoding is needed.
+    """
+    
+    def __init__(self, field: str, path: str, block_size: int = 1 << 20):
+        self.path = path
+        self.block_size = block_size
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        filename = os.path.basename(path).replace('"', '%22')
+        self._head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        self._tail = f'\r\n--{boundary}--\r\n'.encode()
+    
+    def __len__(self) -> int:
+        return len(self._head) + os.path.getsize(self.path) + len(self._tail)
+    
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(self.block_size), b''):
+                yield block
+        yield self._tail
+
+
+def _find_files_command(remote_path: str) -> str:
+    """Build a shell command that lists files under a directory, NUL-delimited.
+    
+    A missing directory is reported as __MISSING__ on stderr before find runs,
+    rather than walking nothing and matching find's error text.
+    """
+    quoted_path = shlex.quote(remote_path)
+    return f"test -d {quoted_path} || {{ echo __MISSING__ >&2; exit 1; }}; find {quoted_path} -type f -print0"
+
+
+def _split_nul(data: bytes) -> List[str]:
+    """Decode NUL-terminated paths, such as find -print0 output."""
+    entries = data.split(b'\0')
+    # Every entry ends in NUL, so the last split element is always empty;
+    # popping it avoids copying the list the way a [:-1] slice would
+    entries.pop()
+    return list(map(os.fsdecode, entries))
+
+
+def _mirror_pairs(remote_files: List[str], remote_dir: str, local_dir: str) -> List[Tuple[str, str]]:
+    """Pair remote files with local paths at the same place relative to local_dir."""
+    return [
+        (remote_path, os.path.join(local_dir, os.path.relpath(remote_path, remote_dir)))
+        for remote_path in remote_files
+    ]
+
+
+def _backoff(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Get a full-jitter exponential backoff delay for a zero-based retry attempt.
+    
+    Randomizing the whole delay keeps clients that failed together from
+    retrying together.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from synchronous code and return its result.
+    
+    asyncio.run refuses to start inside a running event loop, as when an async
+    caller such as VideoAgentProcessor.upload_videos calls upload_file, so there
+    the coroutine gets its own loop on a worker thread while the caller waits.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-transfer-async") as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _get_gpu_status_cached():
+    """Get GPU status from the Hyperbolic API, reusing a recent response."""
+    global _status_cache
+    now = time.monotonic()
+    if _status_cache and now - _status_cache[0] < _STATUS_TTL_SECONDS:
+        return _status_cache[1]
+    
+    status = get_gpu_status()
+    _status_cache = (now, status)
+    return status
+
+
+def _pool_key(ssh_info: dict, compress: bool = False) -> Tuple[str, str, int, bool]:
+    """Get the connection pool key for SSH connection info."""
+    return (ssh_info["host"], ssh_info["username"], ssh_info.get("port", 22), compress)
+
+
+@contextmanager
+def _borrow_client(ssh_info: dict, key_path: str, compress: bool = False) -> Iterator[paramiko.SSHClient]:
+    """Check out an authenticated SSH client from the pool, connecting if none is idle.
+    
+    The client goes back to the pool on exit if its transport is still up, so
+    later commands skip the TCP connect, key exchange and authentication.
+    
+    Args:
+        ssh_info: SSH connection info with host, username, and port
+        key_path: Path to the SSH private key
+        compress: Negotiate zlib compression, worth it for text such as listings
+            but not for media that is already compressed
+        
+    Yields:
+        paramiko.SSHClient: Client for the caller's exclusive use until exit
+    """
+    key = _pool_key(ssh_info, compress)
+    client = None
+    with _SSH_POOL_LOCK:
+        idle = _SSH_POOL.setdefault(key, deque())
+        while idle and client is None:
+            candidate = idle.pop()
+            transport = candidate.get_transport()
+            if transport is not None and transport.is_active():
+                client = candidate
+            else:
+                candidate.close()
+    
+    if client is None:
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            hostname=key[0],
+            port=key[2],
+            username=key[1],
+            key_filename=key_path,
+            passphrase=os.environ.get('SSH_KEY_PASSWORD'),
+            timeout=30,
+            banner_timeout=30,
+            auth_timeout=30,
+            compress=compress
+        )
+    
+    try:
+        yield client
+    finally:
+        transport = client.get_transport()
+        if transport is not None and transport.is_active():
+            with _SSH_POOL_LOCK:
+                _SSH_POOL.setdefault(key, deque()).append(client)
+        else:
+            client.close()
+
+
+def _close_clients(ssh_info: dict) -> None:
+    """Close and forget every idle pooled client for SSH connection info."""
+    with _SSH_POOL_LOCK:
+        idle = [
+            client
+            for compress in (False, True)
+            for client in _SSH_POOL.pop(_pool_key(ssh_info, compress), deque())
+        ]
+    for client in idle:
+        client.close()
+
 class FileTransfer:
-    """Handles file transfers between local machine and GPU instances."""
+    """Handles file transfers between local machine and GPU instances.
+    
+    Prefer FileTransfer.get(instance_id) over constructing directly, so that
+    SSH setup and cached instance lookups are shared by every caller.
+    """
+    
+    # Live handlers by instance ID, shared through FileTransfer.get()
+    _INSTANCES: Dict[str, "FileTransfer"] = {}
+    
+    @classmethod
+    def get(cls, instance_id: str,
+            url_provider: Optional[Callable[[str], Optional[str]]] = None) -> "FileTransfer":
+        """Get the shared file transfer handler for an instance, creating it if needed.
+        
+        Args:
+            instance_id: ID of the GPU instance
+            url_provider: Optional callback, replaces the handler's current one if given
+            
+        Returns:
+            FileTransfer: Handler for the instance
+        """
+        instance = cls._INSTANCES.get(instance_id)
+        if instance is None:
+            instance = cls(instance_id, url_provider=url_provider)
+            cls._INSTANCES[instance_id] = instance
+        elif url_provider is not None:
+            instance._url_provider = url_provider
+        return instance
     
-    def __init__(self, instance_id: str):
+    def __init__(self, instance_id: str,
+                 url_provider: Optional[Callable[[str], Optional[str]]] = None):
         """Initialize file transfer handler.
         
         Args:
             instance_id: ID of the GPU instance
+            url_provider: Optional callback that returns a public download URL for a
+                local file too large for the public relay, or None to give up
         """
         self.instance_id = instance_id
+        self._url_provider = url_provider
+        self._master_target: Optional[str] = None
+        self._master_failed = False
+        self._ssh_info: Optional[dict] = None
+        self._ssh_info_expiry = 0.0
+        self._ip_cache: Optional[Tuple[str, int]] = None
+        self._remote_has_zstd: Optional[bool] = None
+        self._local_hashes: Dict[Tuple[str, int, int], Future] = {}
         self._ensure_ssh_access()
     
+    def __enter__(self) -> "FileTransfer":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Tear down the shared SSH ControlMaster connection and forget this handler."""
+        if FileTransfer._INSTANCES.get(self.instance_id) is self:
+            del FileTransfer._INSTANCES[self.instance_id]
+        
+        if self._ssh_info:
+            _close_clients(self._ssh_info)
+        
+        if not self._master_target:
+            return
+        
+        subprocess.run(
+            ["ssh", "-o", f"ControlPath={self._control_path}", "-O", "exit", self._master_target],
+            capture_output=True,
+            text=True
+        )
+        self._master_target = None
+    
     def _ensure_ssh_access(self) -> None:
         """Ensure SSH access is configured for the instance."""
         # Check if SSH connection is already active
         if ssh_manager.is_connected:
             print("SSH connection is already active. Proceeding...")
+            self._open_master()
             return
             
         # Get SSH key path from environment variable
@@ -82,6 +424,11 @@ class FileTransfer:
             raise RuntimeError(f"Failed to establish SSH connection: {ssh_result}")
             
         print(f"SSH connection established successfully")
+        # The username may have changed and pooled clients belong to the old session
+        if self._ssh_info:
+            _close_clients(self._ssh_info)
+        self._ssh_info = None
+        self._open_master()
     
     def _get_instance_ip(self) -> Optional[Tuple[str, int]]:
         """Get IP address and port for the instance.
@@ -89,8 +436,12 @@ class FileTransfer:
         Returns:
             Tuple of (ip_address, port) if found, None otherwise
         """
+        # Instance addresses do not change for the lifetime of the instance
+        if self._ip_cache:
+            return self._ip_cache
+        
         # Get instance status
-        status_data = get_gpu_status()
+        status_data = _get_gpu_status_cached()
         if isinstance(status_data, str):
             try:
                 status = json.loads(status_data)
@@ -121,111 +472,48 @@ class FileTransfer:
             print(f"Instance {self.instance_id} not found in status data")
             return None
         
-        # Try different ways to extract IP address
-        ip_address = None
-        port = 22  # Default SSH port
-        
-        # Check for sshCommand field first (most reliable)
-        if 'sshCommand' in instance and instance['sshCommand']:
-            ssh_cmd = instance['sshCommand']
-            print(f"Found sshCommand: {ssh_cmd}")
-            
-            # Parse the SSH command (format: "ssh username@hostname -p port")
-            import re
-            host_match = re.search(r'@([^:\s]+)', ssh_cmd)
-            port_match = re.search(r'-p\s+(\d+)', ssh_cmd)
+        # Check the instance itself first, then the nested 'instance' entry
+        nested = instance.get('instance') if isinstance(instance.get('instance'), dict) else {}
+        for prefix, data, fields in (("", instance, _IP_FIELDS),
+                                     ("instance.", nested, _NESTED_IP_FIELDS)):
+            # sshCommand is the most reliable source
+            ssh_cmd = data.get('sshCommand')
+            parsed = _parse_ssh_command(ssh_cmd) if ssh_cmd else None
+            if parsed:
+                print(f"Extracted from {prefix}sshCommand - IP: {parsed[0]}, port: {parsed[1]}")
+                self._ip_cache = parsed
+                return self._ip_cache
             
-            if host_match:
-                ip_address = host_match.group(1)
-                if port_match:
+            # Otherwise take the first populated address field
+            for ip_path, port_path in fields:
+                ip_address = _get_field(data, ip_path)
+                if not ip_address:
+                    continue
+                
+                port = 22  # Default SSH port
+                port_value = _get_field(data, port_path) if port_path else None
+                if port_value:
                     try:
-                        port = int(port_match.group(1))
+                        port = int(port_value)
                     except (ValueError, TypeError):
-                        print(f"Invalid port in sshCommand: {port_match.group(1)}, using default port 22")
-                
-                print(f"Extracted from sshCommand - IP: {ip_address}, port: {port}")
-                return (ip_address, port)
-        
-        # Check for IP in 'ip' field
-        if 'ip' in instance and instance['ip']:
-            ip_address = instance['ip']
-            print(f"Found IP in 'ip' field: {ip_address}")
-        
-        # Check for IP in 'ipAddress' field
-        elif 'ipAddress' in instance and instance['ipAddress']:
-            ip_address = instance['ipAddress']
-            print(f"Found IP in 'ipAddress' field: {ip_address}")
-        
-        # Check for IP in 'ssh' field
-        elif 'ssh' in instance and isinstance(instance['ssh'], dict):
-            ssh_info = instance['ssh']
-            if 'host' in ssh_info and ssh_info['host']:
-                ip_address = ssh_info['host']
-                print(f"Found IP in 'ssh.host' field: {ip_address}")
-            if 'port' in ssh_info and ssh_info['port']:
-                try:
-                    port = int(ssh_info['port'])
-                    print(f"Found port in 'ssh.port' field: {port}")
-                except (ValueError, TypeError):
-                    print(f"Invalid port in 'ssh.port' field: {ssh_info['port']}, using default port 22")
-        
-        # Check for IP in 'network' field
-        elif 'network' in instance and isinstance(instance['network'], dict):
-            network_info = instance['network']
-            if 'ip' in network_info and network_info['ip']:
-                ip_address = network_info['ip']
-                print(f"Found IP in 'network.ip' field: {ip_address}")
-        
-        # Check for IP in 'status' field
-        elif 'status' in instance and isinstance(instance['status'], dict):
-            status_info = instance['status']
-            if 'ip' in status_info and status_info['ip']:
-                ip_address = status_info['ip']
-                print(f"Found IP in 'status.ip' field: {ip_address}")
-        
-        # Check in nested 'instance' field
-        elif 'instance' in instance and isinstance(instance['instance'], dict):
-            nested = instance['instance']
-            
-            # Check for sshCommand in nested instance
-            if 'sshCommand' in nested and nested['sshCommand']:
-                ssh_cmd = nested['sshCommand']
-                print(f"Found sshCommand in nested instance: {ssh_cmd}")
-                
-                # Parse the SSH command
-                import re
-                host_match = re.search(r'@([^:\s]+)', ssh_cmd)
-                port_match = re.search(r'-p\s+(\d+)', ssh_cmd)
+                        print(f"Invalid port in '{prefix}{'.'.join(port_path)}' field: {port_value}, using default port 22")
                 
-                if host_match:
-                    ip_address = host_match.group(1)
-                    if port_match:
-                        try:
-                            port = int(port_match.group(1))
-                        except (ValueError, TypeError):
-                            print(f"Invalid port in nested sshCommand: {port_match.group(1)}, using default port 22")
-                    
-                    print(f"Extracted from nested sshCommand - IP: {ip_address}, port: {port}")
-                    return (ip_address, port)
-            
-            # Check other fields in nested instance
-            for field in ['ip', 'ipAddress', 'hostname', 'address']:
-                if field in nested and nested[field]:
-                    ip_address = nested[field]
-                    print(f"Found IP in nested instance.{field}: {ip_address}")
-                    break
-        
-        if ip_address:
-            return (ip_address, port)
+                print(f"Found IP in '{prefix}{'.'.join(ip_path)}' field: {ip_address}, port: {port}")
+                self._ip_cache = (ip_address, port)
+                return self._ip_cache
+        
         return None
     
-    def upload_file(self, local_path: str, remote_path: str, max_retries: int = 3) -> None:
+    def upload_file(self, local_path: str, remote_path: str, max_retries: int = 3,
+                    chunk_size: int = 8 * 1024 * 1024, max_files: int = 8) -> None:
         """Upload a file to the GPU instance with retry logic.
         
         Args:
             local_path: Path to local file
             remote_path: Destination path on GPU instance
             max_retries: Maximum number of retry attempts
+            chunk_size: Size of each piece for parallel chunked uploads
+            max_files: Maximum number of SFTP channels used for parallel chunked uploads
         """
         if not os.path.exists(local_path):
             raise FileNotFoundError(f"Local file not found: {local_path}")
@@ -233,95 +521,317 @@ class FileTransfer:
         # Ensure SSH connection is active
         self._ensure_ssh_access()
         
-        # Create remote directory if needed
-        remote_dir = str(Path(remote_path).parent)
-        execute_remote_command(f"mkdir -p {remote_dir}", instance_id=self.instance_id)
+        # Each upload path creates the remote directory in its own first command,
+        # so an unwritable directory fails there instead of costing a separate round-trip
+        local_size = os.path.getsize(local_path)
         
-        # Try curl-based upload first
+        # Start hashing now so the digest is ready by the time the upload finishes
+        digest_future = self._hash_local_file(local_path)
         try:
-            print(f"Attempting to upload file via curl: {local_path} -> {remote_path}")
-            self.upload_via_curl(local_path, remote_path, max_retries)
+            # Split large files across several SFTP channels if asyncssh is available
+            if asyncssh is not None and local_size >= chunk_size:
+                try:
+                    print(f"Uploading file in parallel chunks: {local_path} -> {remote_path}")
+                    _run_coroutine(self._aupload_chunked(local_path, remote_path, chunk_size, max_files))
+                    if self._verify_remote_file(local_path, remote_path):
+                        print(f"Successfully uploaded file: {local_path}")
+                        return
+                except Exception as e:
+                    print(f"Parallel chunked upload failed: {str(e)}")
+                print("Falling back to single-stream upload...")
+            
+            # Stream the file directly over SSH
+            try:
+                print(f"Attempting to stream file over SSH: {local_path} -> {remote_path}")
+                self.upload_via_curl(local_path, remote_path, max_retries)
+                return
+            except Exception as e:
+                print(f"Streaming upload failed: {str(e)}")
+                # Without a master connection streaming already went over paramiko SFTP,
+                # and scp could not authenticate either
+                if not self._master_target:
+                    raise
+                print("Falling back to traditional SCP upload...")
+            
+            # Traditional SCP upload (as fallback)
+            # Get SSH connection info
+            ssh_info = self._get_ssh_info()
+            
+            # Build scp command
+            host = ssh_info["host"]
+            port = ssh_info.get("port", 22)
+            user = ssh_info["username"]
+            
+            # Get SSH key path
+            ssh_key_path = os.environ.get('SSH_PRIVATE_KEY_PATH')
+            if not ssh_key_path:
+                raise ValueError("SSH_PRIVATE_KEY_PATH environment variable is required but not set")
+            
+            ssh_key_path = os.path.expanduser(ssh_key_path)
+            
+            # scp does not create missing parent directories; a failure shows up in scp's own error
+            self._remote_exec(["mkdir", "-p", str(Path(remote_path).parent)])
+            
+            # Use scp to upload file with retries
+            for attempt in range(max_retries):
+                try:
+                    # Build the scp command
+                    cmd = [
+                        "scp",
+                        "-P", str(port),
+                        "-o", "StrictHostKeyChecking=no",
+                        "-o", "UserKnownHostsFile=/dev/null",
+                        "-o", "ConnectTimeout=30",
+                        "-o", "ServerAliveInterval=30",
+                        *self._ssh_common_opts(),
+                        "-i", ssh_key_path,
+                        local_path,
+                        f"{user}@{host}:{remote_path}"
+                    ]
+                    
+                    print(f"Uploading file (attempt {attempt+1}/{max_retries}): {local_path} -> {remote_path}")
+                    
+                    # Execute scp command
+                    process = subprocess.run(cmd, capture_output=True, text=True)
+                    
+                    if process.returncode == 0:
+                        print(f"Successfully uploaded file: {local_path}")
+                        
+                        # Verify the file exists on the remote server with the expected size
+                        if self._verify_remote_file(local_path, remote_path):
+                            return
+                    else:
+                        print(f"Upload failed (attempt {attempt+1}/{max_retries}): {process.stderr}")
+                except Exception as e:
+                    print(f"Upload error (attempt {attempt+1}/{max_retries}): {str(e)}")
+                
+                # Wait before retrying
+                if attempt < max_retries - 1:
+                    retry_delay = _backoff(attempt)
+                    print(f"Retrying in {retry_delay:.1f} seconds...")
+                    time.sleep(retry_delay)
+            
+            raise RuntimeError(f"Failed to upload file after {max_retries} attempts: {local_path}")
+        finally:
+            # Verification drops the hash it used; this covers every path failing before it
+            self._release_local_hash(digest_future)
+    
+    def upload_files(self, pairs: List[Tuple[str, str]], max_retries: int = 3, concurrency: int = 8) -> None:
+        """Upload many files to the GPU instance concurrently.
+        
+        Args:
+            pairs: (local_path, remote_path) tuples to upload
+            max_retries: Maximum number of retry attempts per file
+            concurrency: Maximum number of files in flight at once
+        """
+        for local_path, _ in pairs:
+            if not os.path.exists(local_path):
+                raise FileNotFoundError(f"Local file not found: {local_path}")
+        
+        if not pairs:
             return
-        except Exception as e:
-            print(f"Curl-based upload failed: {str(e)}")
-            print("Falling back to traditional SCP upload...")
         
-        # Traditional SCP upload (as fallback)
-        # Get SSH connection info
-        ssh_info = self._get_ssh_info()
+        # Without asyncssh, fall back to uploading one file at a time
+        if asyncssh is None:
+            for local_path, remote_path in pairs:
+                self.upload_file(local_path, remote_path, max_retries)
+            return
         
-        # Build scp command
-        host = ssh_info["host"]
-        port = ssh_info.get("port", 22)
-        user = ssh_info["username"]
+        # Ensure SSH connection is active
+        self._ensure_ssh_access()
         
-        # Get SSH key path
-        ssh_key_path = os.environ.get('SSH_PRIVATE_KEY_PATH')
-        if not ssh_key_path:
-            raise ValueError("SSH_PRIVATE_KEY_PATH environment variable is required but not set")
+        async def _upload_all() -> None:
+            semaphore = asyncio.Semaphore(concurrency)
+            async with self._aconnect() as conn, conn.start_sftp_client() as sftp:
+                remote_dirs = {str(Path(remote_path).parent) for _, remote_path in pairs}
+                await conn.run(shlex.join(["mkdir", "-p", *sorted(remote_dirs)]), check=True)
+                
+                async def _one(local_path: str, remote_path: str) -> None:
+                    async with semaphore:
+                        await self._aupload_file(conn, sftp, local_path, remote_path, max_retries)
+                
+                await asyncio.gather(*[_one(local_path, remote_path) for local_path, remote_path in pairs])
         
-        ssh_key_path = os.path.expanduser(ssh_key_path)
+        _run_coroutine(_upload_all())
+    
+    async def _aupload_file(self, conn, sftp, local_path: str, remote_path: str, max_retries: int = 3) -> None:
+        """Upload and verify one file over an open asyncssh SFTP session with retry logic.
+        
+        Retries wait with asyncio.sleep, so other uploads keep running meanwhile.
         
-        # Use scp to upload file with retries
+        Args:
+            conn: Open asyncssh connection, used to verify the upload
+            sftp: Open asyncssh SFTP client
+            local_path: Path to local file
+            remote_path: Destination path on GPU instance
+            max_retries: Maximum number of retry attempts
+        """
         for attempt in range(max_retries):
             try:
-                # Build the scp command
-                cmd = [
-                    "scp",
-                    "-P", str(port),
-                    "-o", "StrictHostKeyChecking=no",
-                    "-o", "UserKnownHostsFile=/dev/null",
-                    "-o", "ConnectTimeout=30",
-                    "-o", "ServerAliveInterval=30",
-                    "-i", ssh_key_path,
-                    local_path,
-                    f"{user}@{host}:{remote_path}"
-                ]
-                
-                print(f"Uploading file (attempt {attempt+1}/{max_retries}): {local_path} -> {remote_path}")
-                
-                # Execute scp command
-                process = subprocess.run(cmd, capture_output=True, text=True)
+                digest_future = self._hash_local_file(local_path)
+                try:
+                    await sftp.put(local_path, remote_path, block_size=1 << 20, max_requests=64)
+                    result = await conn.run(shlex.join(["sh", "-c", _VERIFY_SCRIPT, "sh", remote_path]))
+                    local_digest = await asyncio.wrap_future(digest_future)
+                finally:
+                    self._release_local_hash(digest_future)
                 
-                if process.returncode == 0:
-                    print(f"Successfully uploaded file: {local_path}")
-                    
-                    # Verify the file exists on the remote server
-                    verify_cmd = f"test -f {remote_path} && echo 'exists'"
-                    verify_result = execute_remote_command(verify_cmd, instance_id=self.instance_id)
-                    
-                    if "exists" in verify_result:
-                        print(f"Verified file exists on remote server: {remote_path}")
-                        return
-                    else:
-                        print(f"Warning: File upload appeared successful, but file not found on remote server")
-                else:
-                    print(f"Upload failed (attempt {attempt+1}/{max_retries}): {process.stderr}")
+                if self._matches_local_file(local_path, remote_path, result.exit_status,
+                                            result.stdout, local_digest):
+                    print(f"Successfully uploaded file: {local_path} -> {remote_path}")
+                    return
             except Exception as e:
-                print(f"Upload error (attempt {attempt+1}/{max_retries}): {str(e)}")
+                print(f"Upload error (attempt {attempt+1}/{max_retries}): {local_path}: {str(e)}")
             
             # Wait before retrying
             if attempt < max_retries - 1:
-                retry_delay = 5 * (attempt + 1)  # Exponential backoff
-                print(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
+                retry_delay = _backoff(attempt)
+                print(f"Retrying in {retry_delay:.1f} seconds...")
+                await asyncio.sleep(retry_delay)
         
         raise RuntimeError(f"Failed to upload file after {max_retries} attempts: {local_path}")
     
-    def upload_via_curl(self, local_path: str, remote_path: str, max_retries: int = 3) -> None:
-        """Upload a file to the GPU instance using curl.
+    def _hash_local_file(self, local_path: str) -> Future:
+        """Get the SHA-256 of a local file, hashing it in the background if not already started.
+        
+        Args:
+            local_path: Path to local file
+            
+        Returns:
+            Future: Resolves to the hex digest of the file
+        """
+        stat_result = os.stat(local_path)
+        key = (os.path.abspath(local_path), stat_result.st_size, stat_result.st_mtime_ns)
+        if key not in self._local_hashes:
+            self._local_hashes[key] = _HASH_EXECUTOR.submit(_sha256_file, local_path)
+        return self._local_hashes[key]
+    
+    def _release_local_hash(self, digest_future: Future) -> None:
+        """Drop a hash from the cache once it has been used to verify an upload.
+        
+        Matching on the future rather than the file's stat key also drops it if the
+        file changed while it was uploading.
+        """
+        self._local_hashes = {
+            key: future for key, future in self._local_hashes.items() if future is not digest_future
+        }
+    
+    def _verify_remote_file(self, local_path: str, remote_path: str) -> bool:
+        """Check in one round-trip that a remote file matches the local file's size and SHA-256.
+        
+        Args:
+            local_path: Path to local file
+            remote_path: Path to file on GPU instance
+            
+        Returns:
+            bool: True if the remote file matches
+        """
+        digest_future = self._hash_local_file(local_path)
+        try:
+            returncode, stdout, _ = self._remote_exec(["sh", "-c", _VERIFY_SCRIPT, "sh", remote_path], timeout=300)
+            local_digest = digest_future.result()
+        finally:
+            self._release_local_hash(digest_future)
+        
+        return self._matches_local_file(local_path, remote_path, returncode, stdout, local_digest)
+    
+    def _matches_local_file(self, local_path: str, remote_path: str, returncode: Optional[int],
+                            stdout: str, local_digest: str) -> bool:
+        """Compare the output of _VERIFY_SCRIPT against the local file.
+        
+        Args:
+            local_path: Path to local file
+            remote_path: Path to file on GPU instance
+            returncode: Exit status of the verify command
+            stdout: Output of the verify command
+            local_digest: Hex SHA-256 of the local file
+            
+        Returns:
+            bool: True if the remote file matches
+        """
+        expected_size = os.path.getsize(local_path)
+        # Output is the size, then "<digest>  -"
+        remote_stat = stdout.split()
+        
+        if returncode != 0 or not remote_stat:
+            print(f"Warning: File upload appeared successful, but file not found on remote server")
+        elif remote_stat[0] != str(expected_size):
+            print(f"Warning: Remote file size {remote_stat[0]} does not match local size {expected_size}")
+        elif remote_stat[1:2] != [local_digest]:
+            print(f"Warning: Remote file checksum does not match local file: {remote_path}")
+        else:
+            print(f"Verified file on remote server (size and SHA-256 match): {remote_path}")
+            return True
+        return False
+    
+    async def _aupload_chunked(self, local_path: str, remote_path: str,
+                               chunk_size: int, max_files: int) -> None:
+        """Upload a file as parallel chunks over several SFTP channels, then join them remotely.
+        
+        Args:
+            local_path: Path to local file
+            remote_path: Destination path on GPU instance
+            chunk_size: Size of each chunk in bytes
+            max_files: Maximum number of SFTP channels uploading at once
+        """
+        file_size = os.path.getsize(local_path)
+        chunks: asyncio.Queue = asyncio.Queue()
+        for index, offset in enumerate(range(0, file_size, chunk_size)):
+            chunks.put_nowait((index, offset))
+        num_channels = min(max_files, chunks.qsize())
+        
+        quoted_path = shlex.quote(remote_path)
+        loop = asyncio.get_running_loop()
+        fd = os.open(local_path, os.O_RDONLY)
+        try:
+            async with self._aconnect() as conn:
+                await conn.run(shlex.join(["mkdir", "-p", str(Path(remote_path).parent)]), check=True)
+                
+                async def _worker() -> None:
+                    async with conn.start_sftp_client() as sftp:
+                        while not chunks.empty():
+                            index, offset = chunks.get_nowait()
+                            # Read off the event loop so other channels keep sending meanwhile
+                            data = await loop.run_in_executor(None, os.pread, fd, chunk_size, offset)
+                            # Zero-padded part names keep the remote glob in chunk order
+                            async with sftp.open(f"{remote_path}.part{index:05d}", "wb") as remote_file:
+                                await remote_file.write(data)
+                
+                try:
+                    await asyncio.gather(*[_worker() for _ in range(num_channels)])
+                    await conn.run(f"cat {quoted_path}.part* > {quoted_path}", check=True)
+                finally:
+                    # A failed cleanup must not mask the error that got us here
+                    try:
+                        await conn.run(f"rm -f {quoted_path}.part*")
+                    except Exception as e:
+                        print(f"Warning: Could not remove chunk files for {remote_path}: {e}")
+        finally:
+            os.close(fd)
+    
+    def upload_via_curl(self, local_path: str, remote_path: str, max_retries: int = 3,
+                        use_public_relay: bool = False) -> None:
+        """Upload a file to the GPU instance without scp.
         
-        This method uploads the file to a temporary file sharing service, then
-        uses curl on the remote instance to download it.
+        By default the file is streamed straight into the remote file over the
+        authenticated SSH connection. With use_public_relay, the file is instead
+        uploaded to a temporary public file sharing service and fetched on the
+        remote instance with curl, which only helps when direct SSH streaming is
+        blocked.
         
         Args:
             local_path: Path to local file
             remote_path: Destination path on GPU instance
             max_retries: Maximum number of retry attempts
+            use_public_relay: Route the file through a public file sharing service
         """
         if not os.path.exists(local_path):
             raise FileNotFoundError(f"Local file not found: {local_path}")
         
+        if not use_public_relay:
+            self._stream_upload(local_path, remote_path, max_retries)
+            return
+        
         # Get file size
         file_size_mb = os.path.getsize(local_path) / (1024 * 1024)
         print(f"File size: {file_size_mb:.2f} MB")
@@ -330,156 +840,251 @@ class FileTransfer:
         # For smaller files (< 25 MB), use transfer.sh
         # For larger files, recommend other services
         
-        if file_size_mb < 25:
-            # Using transfer.sh service (free, no authentication needed)
-            for attempt in range(max_retries):
-                try:
-                    print(f"Uploading to temporary file service (attempt {attempt+1}/{max_retries})...")
-                    
-                    # Generate a unique filename to avoid collisions
-                    unique_filename = f"{uuid.uuid4().hex}_{os.path.basename(local_path)}"
-                    
-                    # Upload file to transfer.sh
-                    upload_cmd = [
-                        "curl", 
-                        "--upload-file", 
-                        local_path,
-                        f"https://transfer.sh/{unique_filename}"
-                    ]
-                    
-                    process = subprocess.run(upload_cmd, capture_output=True, text=True, check=True)
-                    download_url = process.stdout.strip()
-                    
-                    print(f"File uploaded to: {download_url}")
-                    
-                    # Now use curl on the remote server to download the file
-                    print(f"Instructing remote server to download file...")
-                    download_cmd = f"curl -s -L '{download_url}' -o '{remote_path}' && echo 'success'"
-                    result = execute_remote_command(download_cmd, instance_id=self.instance_id, timeout=300)
-                    
-                    if "success" in result:
-                        # Verify file exists and has content
-                        verify_cmd = f"test -s '{remote_path}' && echo 'exists'"
-                        verify_result = execute_remote_command(verify_cmd, instance_id=self.instance_id)
+        # One session keeps the relay's TLS connection alive across calls and retries
+        with requests.Session() as session:
+            if file_size_mb < 25:
+                # Using transfer.sh service (free, no authentication needed)
+                for attempt in range(max_retries):
+                    try:
+                        print(f"Uploading to temporary file service (attempt {attempt+1}/{max_retries})...")
                         
-                        if "exists" in verify_result:
+                        # Generate a unique filename to avoid collisions
+                        unique_filename = f"{uuid.uuid4().hex}_{os.path.basename(local_path)}"
+                        
+                        # Upload file to transfer.sh, streaming it from disk
+                        with open(local_path, 'rb') as f:
+                            response = session.put(f"https://transfer.sh/{unique_filename}", data=f, timeout=300)
+                        response.raise_for_status()
+                        download_url = response.text.strip()
+                        
+                        print(f"File uploaded to: {download_url}")
+                        
+                        # Now use curl on the remote server to download and verify the file
+                        print(f"Instructing remote server to download file...")
+                        result = self._fetch_on_remote(download_url, remote_path, timeout=300)
+                        
+                        if result.endswith("ok"):
                             print(f"Successfully transferred file via curl: {local_path} -> {remote_path}")
                             return
                         else:
-                            print(f"Warning: File download appeared successful, but file not found or empty")
-                    else:
-                        print(f"Curl download failed (attempt {attempt+1}/{max_retries}): {result}")
-                
-                except Exception as e:
-                    print(f"Error during transfer.sh upload (attempt {attempt+1}/{max_retries}): {str(e)}")
-                
-                # Wait before retrying
-                if attempt < max_retries - 1:
-                    retry_delay = 5 * (attempt + 1)  # Exponential backoff
-                    print(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-        
-        # Alternative for larger files: Use gofile.io which supports up to 2GB free
-        elif file_size_mb < 2000:  # Less than 2GB
-            for attempt in range(max_retries):
-                try:
-                    print(f"File is too large for transfer.sh. Using gofile.io (attempt {attempt+1}/{max_retries})...")
-                    
-                    # Step 1: Get server for upload
-                    server_response = subprocess.run(
-                        ["curl", "https://api.gofile.io/getServer"],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    server_data = json.loads(server_response.stdout)
-                    if not server_data.get("status") == "ok":
-                        raise RuntimeError("Failed to get gofile.io server")
-                    
-                    server = server_data["data"]["server"]
-                    
-                    # Step 2: Upload the file
-                    upload_cmd = [
-                        "curl", 
-                        "-F", 
-                        f"file=@{local_path}", 
-                        f"https://{server}.gofile.io/uploadFile"
-                    ]
+                            print(f"Curl download failed (attempt {attempt+1}/{max_retries}): {result}")
                     
-                    process = subprocess.run(upload_cmd, capture_output=True, text=True, check=True)
-                    upload_result = json.loads(process.stdout)
+                    except Exception as e:
+                        print(f"Error during transfer.sh upload (attempt {attempt+1}/{max_retries}): {str(e)}")
                     
-                    if upload_result.get("status") == "ok":
-                        download_url = upload_result["data"]["downloadPage"]
-                        file_id = upload_result["data"]["fileId"]
-                        direct_link = upload_result["data"]["downloadLink"]
+                    # Wait before retrying
+                    if attempt < max_retries - 1:
+                        retry_delay = _backoff(attempt)
+                        print(f"Retrying in {retry_delay:.1f} seconds...")
+                        time.sleep(retry_delay)
+            
+            # Alternative for larger files: Use gofile.io which supports up to 2GB free
+            elif file_size_mb < 2000:  # Less than 2GB
+                for attempt in range(max_retries):
+                    try:
+                        print(f"File is too large for transfer.sh. Using gofile.io (attempt {attempt+1}/{max_retries})...")
                         
-                        print(f"File uploaded to: {download_url}")
-                        print(f"Direct download link: {direct_link}")
+                        # Step 1: Get server for upload
+                        server_response = session.get("https://api.gofile.io/getServer", timeout=30)
+                        server_response.raise_for_status()
+                        server_data = _json_loads(server_response.content)
+                        if not server_data.get("status") == "ok":
+                            raise RuntimeError("Failed to get gofile.io server")
                         
-                        # Now use curl on the remote server to download the file
-                        print(f"Instructing remote server to download file...")
-                        download_cmd = f"curl -s -L '{direct_link}' -o '{remote_path}' && echo 'success'"
-                        result = execute_remote_command(download_cmd, instance_id=self.instance_id, timeout=600)
+                        server = server_data["data"]["server"]
                         
-                        if "success" in result:
-                            # Verify file exists and has content
-                            verify_cmd = f"test -s '{remote_path}' && echo 'exists'"
-                            verify_result = execute_remote_command(verify_cmd, instance_id=self.instance_id)
+                        # Step 2: Upload the file
+                        body = _MultipartFile("file", local_path)
+                        response = session.post(
+                            f"https://{server}.gofile.io/uploadFile",
+                            data=body,
+                            headers={"Content-Type": body.content_type},
+                            timeout=(30, 600)
+                        )
+                        response.raise_for_status()
+                        upload_result = _json_loads(response.content)
+                        
+                        if upload_result.get("status") == "ok":
+                            download_url = upload_result["data"]["downloadPage"]
+                            file_id = upload_result["data"]["fileId"]
+                            direct_link = upload_result["data"]["downloadLink"]
+                            
+                            print(f"File uploaded to: {download_url}")
+                            print(f"Direct download link: {direct_link}")
                             
-                            if "exists" in verify_result:
+                            # Now use curl on the remote server to download and verify the file
+                            print(f"Instructing remote server to download file...")
+                            result = self._fetch_on_remote(direct_link, remote_path, timeout=600)
+                            
+                            if result.endswith("ok"):
                                 print(f"Successfully transferred file via gofile.io: {local_path} -> {remote_path}")
                                 return
                             else:
-                                print(f"Warning: File download appeared successful, but file not found or empty")
+                                print(f"Curl download failed (attempt {attempt+1}/{max_retries}): {result}")
                         else:
-                            print(f"Curl download failed (attempt {attempt+1}/{max_retries}): {result}")
-                    else:
-                        print(f"Failed to upload to gofile.io: {upload_result}")
-                
-                except Exception as e:
-                    print(f"Error during gofile.io upload (attempt {attempt+1}/{max_retries}): {str(e)}")
+                            print(f"Failed to upload to gofile.io: {upload_result}")
+                    
+                    except Exception as e:
+                        print(f"Error during gofile.io upload (attempt {attempt+1}/{max_retries}): {str(e)}")
+                    
+                    # Wait before retrying
+                    if attempt < max_retries - 1:
+                        retry_delay = _backoff(attempt)
+                        print(f"Retrying in {retry_delay:.1f} seconds...")
+                        time.sleep(retry_delay)
+            else:
+                # For extremely large files, provide guidance
+                print(f"File is very large ({file_size_mb:.2f} MB). Consider these options:")
+                print("1. Split the file into smaller parts")
+                print("2. Use a cloud storage service (S3, GCS, etc.)")
+                print("3. Use a dedicated file transfer service")
+                print("\nFalling back to manual file handling...")
+                
+                # Try to use the remote server to download directly from a caller-provided URL
+                url = self._url_provider(local_path) if self._url_provider else None
+                if not url:
+                    raise RuntimeError(
+                        f"File is too large for the public relay ({file_size_mb:.2f} MB): {local_path}. "
+                        "Upload it without use_public_relay, or pass url_provider to FileTransfer "
+                        "to supply a public download URL."
+                    )
                 
-                # Wait before retrying
-                if attempt < max_retries - 1:
-                    retry_delay = 5 * (attempt + 1)  # Exponential backoff
-                    print(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-        else:
-            # For extremely large files, provide guidance
-            print(f"File is very large ({file_size_mb:.2f} MB). Consider these options:")
-            print("1. Split the file into smaller parts")
-            print("2. Use a cloud storage service (S3, GCS, etc.)")
-            print("3. Use a dedicated file transfer service")
-            print("\nFalling back to manual file handling...")
-            
-            # Try to use the remote server to download directly from user-provided URL
-            url = input("Enter a public URL where the file can be downloaded from (or press Enter to skip): ")
-            if url:
                 try:
                     print(f"Instructing remote server to download file from: {url}")
-                    download_cmd = f"curl -s -L '{url}' -o '{remote_path}' && echo 'success'"
-                    result = execute_remote_command(download_cmd, instance_id=self.instance_id, timeout=1800)
+                    result = self._fetch_on_remote(url, remote_path, timeout=1800)
                     
-                    if "success" in result:
-                        # Verify file exists and has content
-                        verify_cmd = f"test -s '{remote_path}' && echo 'exists'"
-                        verify_result = execute_remote_command(verify_cmd, instance_id=self.instance_id)
-                        
-                        if "exists" in verify_result:
-                            print(f"Successfully transferred file via user-provided URL: {url} -> {remote_path}")
-                            return
+                    if result.endswith("ok"):
+                        print(f"Successfully transferred file via provided URL: {url} -> {remote_path}")
+                        return
                     else:
                         print(f"Curl download failed: {result}")
                 except Exception as e:
-                    print(f"Error using user-provided URL: {str(e)}")
-            
-            # If we get here, none of the methods worked
-            raise RuntimeError(f"Failed to upload large file. Please use a cloud service and provide a download URL.")
+                    print(f"Error using provided URL: {str(e)}")
+                
+                # If we get here, none of the methods worked
+                raise RuntimeError(f"Failed to upload large file. Please use a cloud service and provide a download URL.")
                 
         # If we reach this point, all retry attempts failed
         raise RuntimeError(f"Failed to upload file via curl after {max_retries} attempts: {local_path}")
     
+    def _stream_upload(self, local_path: str, remote_path: str, max_retries: int = 3) -> None:
+        """Stream a file into a remote file over SSH, with retry logic.
+        
+        Without a ControlMaster connection the file goes over paramiko SFTP instead.
+        
+        Args:
+            local_path: Path to local file
+            remote_path: Destination path on GPU instance
+            max_retries: Maximum number of retry attempts
+        """
+        if not self._master_target:
+            self._sftp_upload(local_path, remote_path, max_retries)
+            return
+        
+        digest_future = self._hash_local_file(local_path)
+        try:
+            stream_cmd = self._ssh_command(shlex.join(
+                ["sh", "-c", 'mkdir -p "$1" && cat > "$2"', "sh", str(Path(remote_path).parent), remote_path]
+            ))
+            
+            for attempt in range(max_retries):
+                try:
+                    print(f"Streaming file over SSH (attempt {attempt+1}/{max_retries}): {local_path} -> {remote_path}")
+                    with open(local_path, 'rb') as local_file:
+                        process = subprocess.run(stream_cmd, stdin=local_file, capture_output=True)
+                    
+                    if process.returncode == 0:
+                        if self._verify_remote_file(local_path, remote_path):
+                            print(f"Successfully streamed file: {local_path} -> {remote_path}")
+                            return
+                    else:
+                        stderr = process.stderr.decode('utf-8', errors='replace')
+                        print(f"Streaming failed (attempt {attempt+1}/{max_retries}): {stderr}")
+                except Exception as e:
+                    print(f"Streaming error (attempt {attempt+1}/{max_retries}): {str(e)}")
+                
+                # Wait before retrying
+                if attempt < max_retries - 1:
+                    retry_delay = _backoff(attempt)
+                    print(f"Retrying in {retry_delay:.1f} seconds...")
+                    time.sleep(retry_delay)
+            
+            raise RuntimeError(f"Failed to stream file over SSH after {max_retries} attempts: {local_path}")
+        finally:
+            # Verification drops the hash it used; this covers attempts that never got that far
+            self._release_local_hash(digest_future)
+    
+    def _sftp_upload(self, local_path: str, remote_path: str, max_retries: int = 3) -> None:
+        """Upload one file over a pooled paramiko SFTP session with retry logic.
+        
+        Unlike the ssh and scp binaries, paramiko can unlock a passphrase-protected
+        key with SSH_KEY_PASSWORD, so this works when the ControlMaster could not open.
+        
+        Args:
+            local_path: Path to local file
+            remote_path: Destination path on GPU instance
+            max_retries: Maximum number of retry attempts
+        """
+        digest_future = self._hash_local_file(local_path)
+        try:
+            remote_dir = str(Path(remote_path).parent)
+            
+            for attempt in range(max_retries):
+                try:
+                    print(f"Uploading file over SFTP (attempt {attempt+1}/{max_retries}): {local_path} -> {remote_path}")
+                    with _borrow_client(self._get_ssh_info(), self._get_ssh_key_path()) as client:
+                        stdin, stdout, stderr = client.exec_command(shlex.join(["mkdir", "-p", remote_dir]), timeout=60)
+                        if stdout.channel.recv_exit_status() != 0:
+                            errors = stderr.read().decode('utf-8', errors='replace').strip()
+                            raise RuntimeError(f"Could not create remote directory {remote_dir}: {errors}")
+                        sftp = client.open_sftp()
+                        try:
+                            sftp.put(local_path, remote_path)
+                        finally:
+                            sftp.close()
+                    
+                    if self._verify_remote_file(local_path, remote_path):
+                        print(f"Successfully uploaded file: {local_path} -> {remote_path}")
+                        return
+                except Exception as e:
+                    print(f"SFTP upload error (attempt {attempt+1}/{max_retries}): {str(e)}")
+                
+                # Wait before retrying
+                if attempt < max_retries - 1:
+                    retry_delay = _backoff(attempt)
+                    print(f"Retrying in {retry_delay:.1f} seconds...")
+                    time.sleep(retry_delay)
+            
+            raise RuntimeError(f"Failed to upload file over SFTP after {max_retries} attempts: {local_path}")
+        finally:
+            # Verification drops the hash it used; this covers attempts that never got that far
+            self._release_local_hash(digest_future)
+    
+    def _fetch_on_remote(self, url: str, remote_path: str, timeout: int) -> str:
+        """Have the GPU instance download a URL and verify the result in one round-trip.
+        
+        Args:
+            url: URL for the remote instance to download
+            remote_path: Destination path on GPU instance
+            timeout: Command timeout in seconds
+            
+        Returns:
+            str: "ok" on success, otherwise "FAIL:<status>" or an error message
+        """
+        remote_dir = shlex.quote(str(Path(remote_path).parent))
+        quoted_url = shlex.quote(url)
+        quoted_path = shlex.quote(remote_path)
+        fetch_cmd = (
+            f"mkdir -p {remote_dir} && curl -sSfL {quoted_url} -o {quoted_path} "
+            f"&& test -s {quoted_path} && echo ok || echo FAIL:$?"
+        )
+        # Goes over the ControlMaster socket like every other ssh call, so no fresh handshake
+        process = self._ssh_run(fetch_cmd, timeout=timeout)
+        output = process.stdout.strip()
+        if not output:
+            return f"SSH Command Error (status {process.returncode}): {process.stderr.strip()}"
+        return output
+    
     def download_file(self, remote_path: str, local_path: str, max_retries: int = 3) -> None:
         """Download a file from the GPU instance with retry logic.
         
@@ -511,12 +1116,23 @@ class FileTransfer:
         ssh_key_path = os.path.expanduser(ssh_key_path)
         
         # Verify the file exists on the remote server
-        verify_cmd = f"test -f {remote_path} && echo 'exists'"
-        verify_result = execute_remote_command(verify_cmd, instance_id=self.instance_id)
+        returncode, _, stderr = self._remote_exec(["test", "-f", remote_path])
         
-        if "exists" not in verify_result:
+        if returncode == _SSH_CONNECTION_FAILED:
+            raise ConnectionError(f"Could not reach instance {self.instance_id}: {stderr.strip()}")
+        if returncode != 0:
             raise FileNotFoundError(f"Remote file not found: {remote_path}")
         
+        # scp cannot authenticate without the master connection, but paramiko SFTP can
+        if not self._master_target:
+            with _borrow_client(ssh_info, ssh_key_path) as client:
+                sftp = client.open_sftp()
+                try:
+                    self._sftp_download(sftp, remote_path, local_path, max_retries)
+                finally:
+                    sftp.close()
+            return
+        
         # Use scp to download file with retries
         for attempt in range(max_retries):
             try:
@@ -528,6 +1144,7 @@ class FileTransfer:
                     "-o", "UserKnownHostsFile=/dev/null",
                     "-o", "ConnectTimeout=30",
                     "-o", "ServerAliveInterval=30",
+                    *self._ssh_common_opts(),
                     "-i", ssh_key_path,
                     f"{user}@{host}:{remote_path}",
                     local_path
@@ -554,8 +1171,8 @@ class FileTransfer:
             
             # Wait before retrying
             if attempt < max_retries - 1:
-                retry_delay = 5 * (attempt + 1)  # Exponential backoff
-                print(f"Retrying in {retry_delay} seconds...")
+                retry_delay = _backoff(attempt)
+                print(f"Retrying in {retry_delay:.1f} seconds...")
                 time.sleep(retry_delay)
         
         raise RuntimeError(f"Failed to download file after {max_retries} attempts: {remote_path}")
@@ -574,48 +1191,100 @@ class FileTransfer:
         # Ensure SSH connection is active
         self._ensure_ssh_access()
         
-        # Create remote directory if needed
-        execute_remote_command(f"mkdir -p {remote_dir}", instance_id=self.instance_id)
+        # rsync and the tar stream both need the ssh binary, which could not authenticate
+        # without the master connection, so send the files over paramiko/asyncssh instead
+        if not self._master_target:
+            local_root = os.path.normpath(os.path.abspath(local_dir))
+            remote_root = posixpath.join(remote_dir, os.path.basename(local_root))
+            pairs = [
+                (os.path.join(root, name),
+                 posixpath.join(remote_root, Path(os.path.relpath(os.path.join(root, name), local_root)).as_posix()))
+                for root, _, names in os.walk(local_root)
+                for name in names
+            ]
+            print(f"Uploading directory over SFTP: {local_dir} -> {remote_dir}")
+            self.upload_files(pairs, max_retries)
+            print(f"Successfully uploaded directory: {local_dir} -> {remote_dir}")
+            return
         
-        # Create a temporary archive of the directory
-        print(f"Creating temporary archive of directory: {local_dir}")
-        with tempfile.NamedTemporaryFile(suffix='.tar.gz', delete=False) as temp_file:
-            temp_archive = temp_file.name
+        # Only send changed files if rsync is available
+        if shutil.which("rsync"):
+            try:
+                base = os.path.basename(os.path.normpath(os.path.abspath(local_dir)))
+                self.sync_directory(local_dir, f"{remote_dir.rstrip('/')}/{base}")
+                print(f"Successfully uploaded directory: {local_dir} -> {remote_dir}")
+                return
+            except Exception as e:
+                print(f"rsync directory upload failed: {str(e)}")
+                print("Falling back to streaming upload...")
         
-        try:
-            # Create a tar archive of the directory
-            subprocess.run(
-                ["tar", "-czf", temp_archive, "-C", os.path.dirname(local_dir), os.path.basename(local_dir)],
-                check=True,
-                capture_output=True
-            )
-            
-            # Upload the archive using curl
-            remote_archive = f"{remote_dir}/temp_archive.tar.gz"
-            print(f"Uploading archive via curl: {temp_archive} -> {remote_archive}")
-            
+        # Stream tar through the compressor straight into ssh, so reading, compressing,
+        # sending and remote extraction all overlap without a temporary archive
+        for attempt in range(max_retries):
             try:
-                # Try curl-based upload first
-                self.upload_via_curl(temp_archive, remote_archive, max_retries)
+                print(f"Streaming directory over SSH (attempt {attempt+1}/{max_retries}): {local_dir} -> {remote_dir}")
+                self._bulk_upload_tar(local_dir, remote_dir)
+                print(f"Successfully uploaded directory: {local_dir} -> {remote_dir}")
+                return
             except Exception as e:
-                print(f"Curl-based directory upload failed: {str(e)}")
-                print("Falling back to traditional upload_file method...")
-                self.upload_file(temp_archive, remote_archive, max_retries)
+                print(f"Streaming directory upload failed (attempt {attempt+1}/{max_retries}): {str(e)}")
             
-            # Extract the archive on the remote system
-            print(f"Extracting archive on remote system: {remote_archive}")
-            extract_cmd = f"cd {remote_dir} && tar -xzf temp_archive.tar.gz && rm temp_archive.tar.gz && echo 'success'"
-            result = execute_remote_command(extract_cmd, instance_id=self.instance_id, timeout=300)
+            # Wait before retrying
+            if attempt < max_retries - 1:
+                retry_delay = _backoff(attempt)
+                print(f"Retrying in {retry_delay:.1f} seconds...")
+                time.sleep(retry_delay)
+        
+        raise RuntimeError(f"Failed to upload directory after {max_retries} attempts: {local_dir}")
+    
+    def sync_directory(self, local_dir: str, remote_dir: str, delete: bool = False,
+                       files: Optional[List[str]] = None) -> None:
+        """Make remote_dir mirror the contents of local_dir using rsync.
+        
+        Only files that changed since the last sync are sent, as compressed deltas.
+        
+        Args:
+            local_dir: Path to local directory
+            remote_dir: Destination path on GPU instance
+            delete: Remove remote files that no longer exist locally
+            files: Optional paths relative to local_dir to sync instead of the whole tree
+        """
+        if not os.path.isdir(local_dir):
+            raise NotADirectoryError(f"Local directory not found: {local_dir}")
+        
+        # Ensure SSH connection is active
+        self._ensure_ssh_access()
+        if not self._master_target:
+            raise RuntimeError("rsync needs the ssh binary, which could not authenticate to the instance")
+        
+        ssh_info = self._get_ssh_info()
+        remote_dir = remote_dir.rstrip('/')
+        cmd = [
+            "rsync", "-az", "--partial", "--inplace",
+            "-e", shlex.join(self._ssh_transport()),
+            # rsync does not create missing parent directories on its own
+            f"--rsync-path=mkdir -p {shlex.quote(remote_dir)} && rsync",
+        ]
+        if delete:
+            cmd.append("--delete")
+        
+        manifest_path = None
+        try:
+            if files is not None:
+                with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as manifest:
+                    manifest.write("\n".join(files) + "\n")
+                    manifest_path = manifest.name
+                cmd.append(f"--files-from={manifest_path}")
             
-            if "success" not in result:
-                raise RuntimeError(f"Failed to extract archive on remote system: {result}")
-                
-            print(f"Successfully uploaded directory: {local_dir} -> {remote_dir}")
+            cmd += [local_dir.rstrip('/') + '/', f"{ssh_info['username']}@{ssh_info['host']}:{remote_dir}/"]
             
+            print(f"Syncing directory with rsync: {local_dir} -> {remote_dir}")
+            process = subprocess.run(cmd, capture_output=True, text=True)
+            if process.returncode != 0:
+                raise RuntimeError(f"rsync exited with status {process.returncode}: {process.stderr.strip()}")
         finally:
-            # Clean up the temporary archive
-            if os.path.exists(temp_archive):
-                os.unlink(temp_archive)
+            if manifest_path and os.path.exists(manifest_path):
+                os.unlink(manifest_path)
     
     def download_directory(self, remote_dir: str, local_dir: str, max_retries: int = 3) -> None:
         """Download a directory from the GPU instance.
@@ -631,52 +1300,365 @@ class FileTransfer:
         # Create local directory
         os.makedirs(local_dir, exist_ok=True)
         
-        # List files in remote directory
-        cmd = f"find {remote_dir} -type f | sort"
-        result = execute_remote_command(cmd, instance_id=self.instance_id)
+        # Stream the whole tree as one tar over a single SSH connection; the tar stream
+        # needs the ssh binary, so without the master connection go straight to SFTP
+        for attempt in range(max_retries if self._master_target else 0):
+            try:
+                print(f"Streaming directory over SSH (attempt {attempt+1}/{max_retries}): {remote_dir} -> {local_dir}")
+                self._bulk_download_tar(remote_dir, local_dir)
+                print(f"Successfully downloaded directory: {remote_dir} -> {local_dir}")
+                return
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                print(f"Streaming directory download failed (attempt {attempt+1}/{max_retries}): {str(e)}")
+            
+            # Wait before retrying
+            if attempt < max_retries - 1:
+                retry_delay = _backoff(attempt)
+                print(f"Retrying in {retry_delay:.1f} seconds...")
+                time.sleep(retry_delay)
+        
+        # Fetch the files concurrently, listing and downloading over one asyncssh connection if available
+        print("Falling back to parallel SFTP download...")
+        try:
+            if asyncssh is not None:
+                _run_coroutine(self._adownload_directory(remote_dir, local_dir))
+            else:
+                # Unlike list_remote_files, this raises if the listing fails part-way
+                remote_files = list(self.iter_remote_files(remote_dir))
+                self.download_files(_mirror_pairs(remote_files, remote_dir, local_dir), max_retries)
+            print(f"Successfully downloaded directory: {remote_dir} -> {local_dir}")
+            return
+        except Exception as e:
+            print(f"Parallel SFTP download failed: {str(e)}")
+        
+        raise RuntimeError(f"Failed to download directory after {max_retries} attempts: {remote_dir}")
+    
+    def download_files(self, pairs: List[Tuple[str, str]], max_retries: int = 3, concurrency: int = 8) -> None:
+        """Download many files from the GPU instance concurrently.
         
-        if result.startswith("Error") or "No such file or directory" in result:
-            raise FileNotFoundError(f"Remote directory not found or empty: {remote_dir}")
+        Each worker thread holds one pooled SSH client and SFTP session for all of
+        its files, since paramiko channels must not be shared between threads.
         
-        # Download each file
-        for remote_path in result.strip().split('\n'):
-            if not remote_path:
-                continue
-                
-            # Calculate relative path from remote_dir
-            rel_path = os.path.relpath(remote_path, remote_dir)
-            local_path = os.path.join(local_dir, rel_path)
-            
-            # Create local directory structure
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        Args:
+            pairs: (remote_path, local_path) tuples to download
+            max_retries: Maximum number of retry attempts per file
+            concurrency: Maximum number of files in flight at once
+        """
+        if not pairs:
+            return
+        
+        ssh_info = self._get_ssh_info()
+        key_path = self._get_ssh_key_path()
+        
+        def _download_shard(shard: List[Tuple[str, str]]) -> None:
+            with _borrow_client(ssh_info, key_path) as client:
+                sftp = client.open_sftp()
+                try:
+                    for remote_path, local_path in shard:
+                        self._sftp_download(sftp, remote_path, local_path, max_retries)
+                finally:
+                    sftp.close()
+        
+        # Deal files round-robin so each worker keeps a stable connection
+        workers = min(concurrency, len(pairs))
+        shards = [pairs[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-transfer-sftp") as executor:
+            for future in [executor.submit(_download_shard, shard) for shard in shards]:
+                future.result()
+    
+    def _sftp_download(self, sftp: paramiko.SFTPClient, remote_path: str, local_path: str,
+                       max_retries: int = 3) -> None:
+        """Download one file over an open paramiko SFTP session with retry logic.
+        
+        Args:
+            sftp: Open paramiko SFTP client
+            remote_path: Path to file on GPU instance
+            local_path: Destination path on local machine
+            max_retries: Maximum number of retry attempts
+        """
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        
+        for attempt in range(max_retries):
+            try:
+                sftp.get(remote_path, local_path)
+                print(f"Successfully downloaded file: {remote_path} -> {local_path}")
+                return
+            except Exception as e:
+                print(f"Download error (attempt {attempt+1}/{max_retries}): {remote_path}: {str(e)}")
             
-            # Download the file
-            self.download_file(remote_path, local_path, max_retries)
+            # Wait before retrying
+            if attempt < max_retries - 1:
+                retry_delay = _backoff(attempt)
+                print(f"Retrying in {retry_delay:.1f} seconds...")
+                time.sleep(retry_delay)
+        
+        raise RuntimeError(f"Failed to download file after {max_retries} attempts: {remote_path}")
+    
+    def _aconnect(self):
+        """Open an asyncssh connection to the instance.
+        
+        Returns:
+            An awaitable asyncssh connection, usable as an async context manager
+        """
+        ssh_info = self._get_ssh_info()
+        return asyncssh.connect(
+            ssh_info["host"],
+            port=ssh_info.get("port", 22),
+            username=ssh_info["username"],
+            client_keys=[self._get_ssh_key_path()],
+            passphrase=os.environ.get('SSH_KEY_PASSWORD'),
+            known_hosts=None
+        )
+    
+    async def _adownload_directory(self, remote_dir: str, local_dir: str, concurrency: int = 8) -> None:
+        """List and download a directory's files over a single asyncssh connection.
+        
+        Args:
+            remote_dir: Path to directory on GPU instance
+            local_dir: Destination path on local machine
+            concurrency: Maximum number of files in flight at once
+        """
+        async with self._aconnect() as conn:
+            remote_files = await self._alist_files(conn, remote_dir)
+            async with conn.start_sftp_client() as sftp:
+                await self._adownload_many(sftp, _mirror_pairs(remote_files, remote_dir, local_dir), concurrency)
+    
+    async def _adownload_many(self, sftp, pairs: List[Tuple[str, str]], concurrency: int = 8) -> None:
+        """Download many files concurrently over a single SFTP session.
+        
+        Args:
+            sftp: Open asyncssh SFTP client
+            pairs: (remote_path, local_path) tuples to download
+            concurrency: Maximum number of files in flight at once
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _one(remote_path: str, local_path: str) -> None:
+            async with semaphore:
+                os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+                # 1 MB blocks with a deep request pipeline keep the link busy on high-RTT paths
+                await sftp.get(remote_path, local_path, block_size=1 << 20, max_requests=64)
+        
+        await asyncio.gather(*[_one(remote_path, local_path) for remote_path, local_path in pairs])
     
-    def list_remote_files(self, remote_path: str) -> List[str]:
+    def list_remote_files(self, remote_path: str, expect_flat: bool = False) -> List[str]:
         """List files in a remote directory.
         
         Args:
             remote_path: Path to directory on GPU instance
+            expect_flat: The directory likely has no subdirectories, so try a single
+                SFTP read before falling back to find
             
         Returns:
-            List of file paths
+            List of file paths; may be partial, with a warning printed, if part of
+            the tree could not be read. Use iter_remote_files to get the error instead.
         """
-        # Ensure SSH connection is active
-        self._ensure_ssh_access()
+        # Keep whatever was listed before a failure, e.g. one unreadable subdirectory
+        paths = []
+        try:
+            for path in self.iter_remote_files(remote_path, expect_flat):
+                paths.append(path)
+        except Exception as e:
+            print(f"Warning: Listing of {remote_path} may be incomplete: {str(e)}")
+        
+        # Sorting here saves a remote sort process and matches its order under LC_ALL=C
+        paths.sort()
+        return paths
+    
+    def iter_remote_files(self, remote_path: str, expect_flat: bool = False) -> Iterator[str]:
+        """Yield the files in a remote directory as the listing arrives.
+        
+        Paths come in the order the instance reports them, so callers can start
+        work on the first files before a large tree has been fully walked.
+        
+        Args:
+            remote_path: Path to directory on GPU instance
+            expect_flat: The directory likely has no subdirectories, so try a single
+                SFTP read before falling back to find
+            
+        Yields:
+            str: Remote file path
+            
+        Raises:
+            RuntimeError: If the path could not be searched
+        """
+        # List files in remote directory over a pooled, already authenticated connection.
+        # Paths are repetitive text, so large listings shrink several times under zlib.
+        with _borrow_client(self._get_ssh_info(), self._get_ssh_key_path(), compress=True) as client:
+            paths = self._list_flat_directory(client, remote_path) if expect_flat else None
+            if paths is None:
+                yield from self._find_files(client, remote_path)
+            else:
+                yield from paths
+    
+    def _list_flat_directory(self, client: paramiko.SSHClient, remote_path: str) -> Optional[List[str]]:
+        """List a directory's files with one SFTP read, if it has no subdirectories.
+        
+        Walking a tree over SFTP costs a round-trip per directory, so trees are
+        left to a single find instead.
+        
+        Args:
+            client: Connected SSH client
+            remote_path: Path to directory on GPU instance
+            
+        Returns:
+            List of file paths, or None if find should list the path instead
+        """
+        try:
+            sftp = client.open_sftp()
+        except paramiko.SSHException:
+            # The SFTP subsystem may be disabled on the instance; find still works
+            return None
+        
+        paths = []
+        try:
+            # Stop reading at the first subdirectory, since find has to walk the tree anyway
+            for entry in sftp.listdir_iter(remote_path, read_aheads=1):
+                mode = entry.st_mode or 0
+                if stat.S_ISDIR(mode):
+                    return None
+                # Like find -type f, symlinks are skipped since the attributes come from lstat
+                if stat.S_ISREG(mode):
+                    paths.append(posixpath.join(remote_path, entry.filename))
+        except FileNotFoundError:
+            return []
+        except IOError:
+            # Let find's directory check tell a plain file from an unreadable directory
+            return None
+        finally:
+            sftp.close()
+        
+        return paths
+    
+    def _find_files(self, client: paramiko.SSHClient, remote_path: str) -> Iterator[str]:
+        """Stream every file under a remote path from a single find.
+        
+        Args:
+            client: Connected SSH client
+            remote_path: Path on GPU instance
+            
+        Yields:
+            str: Remote file path
+            
+        Raises:
+            RuntimeError: If find exits with an error
+        """
+        # NUL separators survive any filename, including ones with newlines
+        stdin, stdout, stderr = client.exec_command(_find_files_command(remote_path), timeout=300)
+        channel = stdout.channel
+        try:
+            # Keep the unterminated tail of each block until the rest of its path arrives
+            pending = b''
+            for block in iter(lambda: channel.recv(1 << 16), b''):
+                entries = (pending + block).split(b'\0')
+                pending = entries.pop()
+                yield from map(os.fsdecode, entries)
+            exit_status = channel.recv_exit_status()
+            missing = exit_status != 0 and b"__MISSING__" in stderr.read()
+        finally:
+            # Stops find early if the caller abandons the listing
+            channel.close()
+        
+        # A missing directory has no files; anything else is a real failure
+        if exit_status != 0 and not missing:
+            raise RuntimeError(f"find exited with status {exit_status} for {remote_path}")
+    
+    async def list_remote_files_async(self, remote_path: str) -> List[str]:
+        """List files in a remote directory without blocking the event loop.
+        
+        Args:
+            remote_path: Path to directory on GPU instance
+            
+        Returns:
+            List of file paths, empty if the directory is missing
+            
+        Raises:
+            RuntimeError: If the directory could not be fully searched
+        """
+        # Without asyncssh, run the same find over a pooled paramiko client on a worker thread
+        if asyncssh is None:
+            return await asyncio.to_thread(lambda: sorted(self.iter_remote_files(remote_path)))
+        
+        async with self._aconnect() as conn:
+            return await self._alist_files(conn, remote_path)
+    
+    async def _alist_files(self, conn, remote_path: str) -> List[str]:
+        """List every file under a remote path over an open asyncssh connection.
+        
+        Args:
+            conn: Open asyncssh connection
+            remote_path: Path on GPU instance
+            
+        Returns:
+            List of file paths, empty if the directory is missing
+            
+        Raises:
+            RuntimeError: If find exits with an error, so a partial walk is never
+                mistaken for the whole directory
+        """
+        result = await conn.run(_find_files_command(remote_path), encoding=None)
+        if result.exit_status != 0:
+            if b"__MISSING__" in (result.stderr or b""):
+                return []
+            raise RuntimeError(f"find exited with status {result.exit_status} for {remote_path}")
+        
+        paths = _split_nul(result.stdout)
+        paths.sort()
+        return paths
+    
+    def run_batch(self, commands: List[str], timeout: int = 300) -> List[Tuple[int, str]]:
+        """Run several shell commands on the instance in a single round-trip.
         
-        # List files in remote directory
-        cmd = f"find {remote_path} -type f | sort"
-        result = execute_remote_command(cmd, instance_id=self.instance_id)
+        Each command runs in its own subshell, so a failing or exiting command
+        does not stop the ones after it.
         
-        if result.startswith("Error") or "No such file or directory" in result:
+        Args:
+            commands: Shell commands to run, in order
+            timeout: Timeout in seconds for the whole batch
+            
+        Returns:
+            List of (exit status, stdout) tuples, one per command
+        """
+        if not commands:
             return []
         
-        return [path for path in result.strip().split('\n') if path]
+        # A per-batch token keeps command output from being mistaken for a separator
+        token = uuid.uuid4().hex
+        script = "".join(
+            f"( {cmd}\n); printf '\\n__SEP_{token}_%s__\\n' $?\n" for cmd in commands
+        )
+        with _borrow_client(self._get_ssh_info(), self._get_ssh_key_path()) as client:
+            stdin, stdout, stderr = client.exec_command(script, timeout=timeout)
+            output = stdout.read().decode('utf-8', errors='replace')
+            stdout.channel.recv_exit_status()
+        
+        # Splitting yields [out_0, status_0, out_1, status_1, ..., trailing text]
+        parts = re.split(rf"\n__SEP_{token}_(\d+)__\n", output)
+        if len(parts) != 2 * len(commands) + 1:
+            raise RuntimeError(f"Batch ended early: got {len(parts) // 2} of {len(commands)} results")
+        
+        return [(int(parts[i + 1]), parts[i]) for i in range(0, 2 * len(commands), 2)]
     
     def _get_ssh_info(self) -> dict:
         """Get SSH connection information.
         
+        Returns:
+            dict: SSH connection info with host, username, and port
+        """
+        # Checking ssh_manager costs a round-trip, so reuse a recent answer
+        now = time.monotonic()
+        if self._ssh_info and now < self._ssh_info_expiry:
+            return self._ssh_info
+        
+        self._ssh_info = self._lookup_ssh_info()
+        self._ssh_info_expiry = now + _SSH_INFO_TTL_SECONDS
+        return self._ssh_info
+    
+    def _lookup_ssh_info(self) -> dict:
+        """Resolve SSH connection information without the cache.
+        
         Returns:
             dict: SSH connection info with host, username, and port
         """
@@ -704,4 +1686,283 @@ class FileTransfer:
             "host": ip_address,
             "username": username,
             "port": port
-        } 
\ No newline at end of file
+        }
+    
+    def _get_ssh_key_path(self) -> str:
+        """Get the expanded SSH private key path from the environment.
+        
+        Returns:
+            str: Path to the SSH private key
+        """
+        ssh_key_path = os.environ.get('SSH_PRIVATE_KEY_PATH')
+        if not ssh_key_path:
+            raise ValueError("SSH_PRIVATE_KEY_PATH environment variable is required but not set")
+        
+        return os.path.expanduser(ssh_key_path)
+    
+    @property
+    def _control_path(self) -> str:
+        """Path of the ControlMaster socket shared by every ssh/scp call for this instance.
+        
+        A fixed-length hash keeps the path, plus the suffix ssh appends while creating
+        the socket, well under the ~104-byte Unix socket path limit for any host name.
+        """
+        digest = hashlib.sha256(self.instance_id.encode()).hexdigest()[:16]
+        return f"/tmp/fx-cm-{digest}"
+    
+    def _ssh_common_opts(self) -> List[str]:
+        """Get ssh/scp options that multiplex connections over the ControlMaster socket.
+        
+        BatchMode makes a call fail at once instead of waiting on a passphrase
+        prompt, which the ssh binary cannot answer from SSH_KEY_PASSWORD.
+        
+        Returns:
+            List[str]: Options to splice into ssh or scp argument vectors
+        """
+        return [
+            "-o", "BatchMode=yes",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._control_path}",
+            "-o", "ControlPersist=10m"
+        ]
+    
+    def _open_master(self) -> None:
+        """Open the ControlMaster connection so later ssh/scp calls skip the handshake."""
+        # A failed attempt is not retried, so later calls don't each pay another handshake
+        if self._master_target or self._master_failed:
+            return
+        
+        ssh_info = self._get_ssh_info()
+        target = f"{ssh_info['username']}@{ssh_info['host']}"
+        cmd = [
+            "ssh",
+            "-M", "-N", "-f",
+            "-p", str(ssh_info.get("port", 22)),
+            "-i", self._get_ssh_key_path(),
+            "-o", "StrictHostKeyChecking=no",
+            "-o", "UserKnownHostsFile=/dev/null",
+            "-o", "ConnectTimeout=30",
+            "-o", "ServerAliveInterval=30",
+            "-o", "BatchMode=yes",
+            "-o", f"ControlPath={self._control_path}",
+            "-o", "ControlPersist=10m",
+            target
+        ]
+        
+        try:
+            process = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        except Exception as e:
+            self._master_failed = True
+            print(f"Warning: Could not open SSH master connection: {str(e)}")
+            return
+        
+        if process.returncode == 0:
+            self._master_target = target
+        else:
+            # Short commands fall back to paramiko, which can use SSH_KEY_PASSWORD
+            self._master_failed = True
+            print(f"Warning: Could not open SSH master connection: {process.stderr.strip()}")
+    
+    def _ssh_transport(self) -> List[str]:
+        """Build the ssh program and options used to reach the instance, without a target.
+        
+        Returns:
+            List[str]: Argument vector prefix for ssh
+        """
+        ssh_info = self._get_ssh_info()
+        return [
+            "ssh",
+            "-p", str(ssh_info.get("port", 22)),
+            "-i", self._get_ssh_key_path(),
+            "-o", "StrictHostKeyChecking=no",
+            "-o", "UserKnownHostsFile=/dev/null",
+            "-o", "ConnectTimeout=30",
+            "-o", "ServerAliveInterval=30",
+            *self._ssh_common_opts()
+        ]
+    
+    def _ssh_command(self, remote_command: str) -> List[str]:
+        """Build an ssh command line that runs a command on the instance.
+        
+        Args:
+            remote_command: Shell command to run on the GPU instance
+            
+        Returns:
+            List[str]: Argument vector for subprocess
+        """
+        ssh_info = self._get_ssh_info()
+        return [*self._ssh_transport(), f"{ssh_info['username']}@{ssh_info['host']}", remote_command]
+    
+    def _remote_exec(self, argv: List[str], timeout: int = 60) -> Tuple[int, str, str]:
+        """Run a command on the instance from an argument vector, without manual quoting.
+        
+        Args:
+            argv: Program and arguments, passed through unchanged
+            timeout: Command timeout in seconds
+            
+        Returns:
+            Tuple of (exit status, stdout, stderr)
+        """
+        process = self._ssh_run(shlex.join(argv), timeout=timeout)
+        return process.returncode, process.stdout, process.stderr
+    
+    def _ssh_run(self, remote_command: str, timeout: int = 60) -> subprocess.CompletedProcess:
+        """Run a short command on the instance over the shared SSH connection.
+        
+        Without a ControlMaster the ssh binary may be unable to authenticate, for
+        example with a passphrase-protected key, so the command runs over a pooled
+        paramiko client instead.
+        
+        Args:
+            remote_command: Shell command to run on the GPU instance
+            timeout: Command timeout in seconds
+            
+        Returns:
+            subprocess.CompletedProcess: Finished process with text stdout/stderr.
+                Like ssh, a return code of 255 means the connection itself failed.
+        """
+        if not self._master_target:
+            return self._paramiko_run(remote_command, timeout)
+        
+        try:
+            return subprocess.run(self._ssh_command(remote_command), capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return subprocess.CompletedProcess(remote_command, 255, "", f"Timed out after {timeout} seconds")
+    
+    def _paramiko_run(self, remote_command: str, timeout: int = 60) -> subprocess.CompletedProcess:
+        """Run a short command on the instance over a pooled paramiko client.
+        
+        Args:
+            remote_command: Shell command to run on the GPU instance
+            timeout: Command timeout in seconds
+            
+        Returns:
+            subprocess.CompletedProcess: Finished process with text stdout/stderr,
+                with return code 255 if the connection failed
+        """
+        try:
+            with _borrow_client(self._get_ssh_info(), self._get_ssh_key_path()) as client:
+                stdin, stdout, stderr = client.exec_command(remote_command, timeout=timeout)
+                output = stdout.read().decode('utf-8', errors='replace')
+                errors = stderr.read().decode('utf-8', errors='replace')
+                returncode = stdout.channel.recv_exit_status()
+        except socket.timeout:
+            return subprocess.CompletedProcess(remote_command, 255, "", f"Timed out after {timeout} seconds")
+        except Exception as e:
+            return subprocess.CompletedProcess(remote_command, 255, "", f"SSH connection failed: {str(e)}")
+        
+        return subprocess.CompletedProcess(remote_command, returncode, output, errors)
+    
+    def _run_pipeline(self, commands: List[List[str]]) -> None:
+        """Run commands connected stdout-to-stdin, like a shell pipeline.
+        
+        Args:
+            commands: Argument vectors, from first producer to last consumer
+            
+        Raises:
+            RuntimeError: If any command in the pipeline exits non-zero
+        """
+        processes = []
+        stderr_files = []
+        try:
+            for i, cmd in enumerate(commands):
+                # Spool stderr to disk so a chatty stage can never block the pipe
+                stderr_file = tempfile.TemporaryFile()
+                stderr_files.append(stderr_file)
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=processes[-1].stdout if processes else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE if i < len(commands) - 1 else subprocess.DEVNULL,
+                    stderr=stderr_file
+                )
+                # Let the upstream stage see SIGPIPE if this stage exits early
+                if processes:
+                    processes[-1].stdout.close()
+                processes.append(process)
+            
+            errors = []
+            for cmd, process, stderr_file in zip(commands, processes, stderr_files):
+                process.wait()
+                if process.returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode('utf-8', errors='replace').strip()
+                    errors.append(f"{cmd[0]} exited with status {process.returncode}: {stderr}")
+            
+            if errors:
+                raise RuntimeError("; ".join(errors))
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            for stderr_file in stderr_files:
+                stderr_file.close()
+    
+    def _bulk_upload_tar(self, local_dir: str, remote_dir: str) -> None:
+        """Stream a directory to the GPU instance as a tar archive over one SSH connection.
+        
+        The directory is extracted inside remote_dir, matching upload_directory.
+        
+        Args:
+            local_dir: Path to local directory
+            remote_dir: Destination path on GPU instance
+        """
+        local_dir = os.path.normpath(os.path.abspath(local_dir))
+        parent, base = os.path.dirname(local_dir), os.path.basename(local_dir)
+        quoted_dir = shlex.quote(remote_dir)
+        
+        compress_cmd, decompress_cmd = self._upload_codec()
+        
+        self._run_pipeline([
+            ["tar", "-cf", "-", "-C", parent, base],
+            compress_cmd,
+            self._ssh_command(
+                f"mkdir -p {quoted_dir} && {shlex.join(decompress_cmd)} | tar -xf - -C {quoted_dir}"
+            )
+        ])
+    
+    def _upload_codec(self) -> Tuple[List[str], List[str]]:
+        """Pick the fastest compressor that both this machine and the instance support.
+        
+        Returns:
+            Tuple of (local compress argv, remote decompress argv)
+        """
+        has_zstd = self._remote_has_zstd
+        if has_zstd is None:
+            has_zstd = _HAS_LOCAL_ZSTD
+            if has_zstd:
+                returncode = self._ssh_run("command -v zstd").returncode
+                has_zstd = returncode == 0
+                # Only remember the answer if the probe actually reached the instance
+                if returncode != _SSH_CONNECTION_FAILED:
+                    self._remote_has_zstd = has_zstd
+            else:
+                self._remote_has_zstd = False
+        if has_zstd:
+            return _ZSTD_CODEC
+        
+        compress_cmd, decompress_cmd = _GZIP_CODEC
+        return [_LOCAL_GZIP, *compress_cmd[1:]], decompress_cmd
+    
+    def _bulk_download_tar(self, remote_dir: str, local_dir: str) -> None:
+        """Stream a directory from the GPU instance as a tar archive over one SSH connection.
+        
+        The contents of remote_dir are extracted directly into local_dir.
+        
+        Args:
+            remote_dir: Path to directory on GPU instance
+            local_dir: Destination path on local machine
+        """
+        quoted_dir = shlex.quote(remote_dir)
+        try:
+            self._run_pipeline([
+                # Flag a missing directory explicitly rather than matching tar's error text
+                self._ssh_command(
+                    f"test -d {quoted_dir} || {{ echo __MISSING__ >&2; exit 1; }}; tar -cf - -C {quoted_dir} ."
+                ),
+                ["tar", "-xf", "-", "-C", local_dir]
+            ])
+        except RuntimeError as e:
+            if "__MISSING__" in str(e):
+                raise FileNotFoundError(f"Remote directory not found: {remote_dir}") from e
+            raise
@@ -486,7 +486,7 @@ class VideoAgentProcessor:
                     video_paths = [str(p) for p in video_paths]
                 else:
                     remote_input_dir = f"{processor.workspace_dir}/input_videos"
-                    video_paths = processor.file_transfer.list_remote_files(remote_input_dir)
+                    video_paths = processor.file_transfer.list_remote_files(remote_input_dir, expect_flat=True)
                     video_paths = [p for p in video_paths if p.endswith(".mp4")]
                 
                 if not video_paths:
@@ -466,7 +466,7 @@ class VideoProcessor:
                     from .file_transfer import FileTransfer
                     from .scene_processor import SceneProcessor
                     
-                    self.file_transfer = FileTransfer(self.instance_id)
+                    self.file_transfer = FileTransfer.get(self.instance_id)
                     self.scene_processor = SceneProcessor(self.instance_id, self.workspace_dir)
                     
                     # Set up the environment
@@ -495,7 +495,7 @@ class VideoProcessor:
                         from .file_transfer import FileTransfer
                         from .scene_processor import SceneProcessor
                         
-                        self.file_transfer = FileTransfer(self.instance_id)
+                        self.file_transfer = FileTransfer.get(self.instance_id)
                         self.scene_processor = SceneProcessor(self.instance_id, self.workspace_dir)
                         
                         # Set up the environment
@@ -621,13 +621,20 @@ class VideoProcessor:
         if self.local_mode:
             return
         
-        # Check if we have sudo access
-        sudo_check = execute_remote_command("sudo -n true && echo 'sudo_ok' || echo 'sudo_fail'", instance_id=self.instance_id)
-        has_sudo = "sudo_ok" in sudo_check
+        # Probe sudo access, the home directory and required tools in one round-trip
+        required_tools = ["ffmpeg", "python3", "pip3"]
+        probe_commands = ["sudo -n true", "echo $HOME"] + [f"command -v {tool}" for tool in required_tools]
+        try:
+            probes = self.file_transfer.run_batch(probe_commands)
+        except Exception as e:
+            # Treat every probe as failed rather than aborting the whole setup
+            print(f"Warning: Environment probes failed: {e}")
+            probes = [(1, "")] * len(probe_commands)
+        has_sudo = probes[0][0] == 0
         
         # If we don't have sudo access, use a user-writable directory instead of /workspace
-        if not has_sudo and self.workspace_dir.startswith("/workspace"):
-            user_home = execute_remote_command("echo $HOME", instance_id=self.instance_id).strip()
+        user_home = probes[1][1].strip()
+        if not has_sudo and user_home and self.workspace_dir.startswith("/workspace"):
             self.workspace_dir = f"{user_home}/workspace"
             print(f"No sudo access. Using user workspace directory: {self.workspace_dir}")
         
@@ -659,10 +666,9 @@ class VideoProcessor:
                     print("Continuing with setup process...")
         else:
             print("No sudo access. Skipping system package installation.")
-            # Try to check if required tools are available
-            for tool in ["ffmpeg", "python3", "pip3"]:
-                result = execute_remote_command(f"which {tool} || echo 'not_found'", instance_id=self.instance_id)
-                if "not_found" in result:
+            # Report required tools that were not found
+            for tool, (status, _) in zip(required_tools, probes[2:]):
+                if status != 0:
                     print(f"Warning: {tool} not found and cannot be installed without sudo access")
         
         # Install Python packages (doesn't require sudo)